@@ -1,4 +1,5 @@
 """Supervisor Agent - Main orchestrator for the therapist system."""
+import asyncio
 from typing import Dict, Any, Optional, List, AsyncGenerator
 from datetime import datetime
 from pydantic import BaseModel, Field
@@ -183,7 +184,6 @@ class SupervisorAgent:
         logger = logging.getLogger(__name__)
 
         # Run the streaming workflow
-        full_response = ""
         async for event in run_therapist_workflow_streaming(
             child_id=child_id,
             child_age=child_age,
@@ -201,7 +201,6 @@ class SupervisorAgent:
             elif event_type == "token":
                 # Stream token
                 token = event.get("content", "")
-                full_response += token
                 yield {"type": "token", "content": token}
 
             elif event_type == "done":
@@ -247,8 +246,16 @@ class SupervisorAgent:
         import logging
         logger = logging.getLogger(__name__)
 
-        # Extract important information using LLM
-        extracted = await self._extract_memory_with_llm(concern, behavior_analysis)
+        # Extract important information using LLM; the existing memory is read
+        # while the model runs (a wasted read if nothing is worth remembering)
+        extracted, memory_data = await asyncio.gather(
+            self._extract_memory_with_llm(concern, behavior_analysis),
+            self.memory_backends.get_long_term_memory(
+                child_id=child_id,
+                memory_type="behavioral_patterns",
+                key="main"
+            )
+        )
 
         # Only proceed if there's something worth remembering
         if not extracted.should_remember:
@@ -260,13 +267,9 @@ class SupervisorAgent:
                    f"{len(extracted.behaviors)} behaviors, "
                    f"{len(extracted.family_context)} family context items")
 
-        # Get existing memory or create new
-        memory_data = await self.memory_backends.get_long_term_memory(
-            child_id=child_id,
-            memory_type="behavioral_patterns",
-            key="main"
-        )
+        now_iso = datetime.now().isoformat()
 
+        # Use existing memory or create new
         if memory_data:
             child_memory = ChildMemory.from_dict(memory_data)
         else:
@@ -307,6 +310,9 @@ class SupervisorAgent:
             )
             logger.info(f"[MEMORY] Added behavior: {behavior.behavior}")
 
+        # The namespaces written below are independent; save them concurrently
+        saves = []
+
         # Store family context as a separate memory type
         if extracted.family_context:
             family_data = {
@@ -315,15 +321,15 @@ class SupervisorAgent:
                     {"type": ctx.context_type, "details": ctx.details}
                     for ctx in extracted.family_context
                 ],
-                "last_updated": datetime.now().isoformat()
+                "last_updated": now_iso
             }
-            await self.memory_backends.save_long_term_memory(
+            saves.append(self.memory_backends.save_long_term_memory(
                 child_id=child_id,
                 memory_type="family_context",
                 key="main",
                 data=family_data
-            )
-            logger.info(f"[MEMORY] Saved family context: {len(extracted.family_context)} items")
+            ))
+            logger.info(f"[MEMORY] Saving family context: {len(extracted.family_context)} items")
 
         # Store emotional triggers
         if extracted.emotional_triggers:
@@ -337,23 +343,24 @@ class SupervisorAgent:
             existing_triggers = set(triggers_data.get("triggers", []))
             new_triggers = [t for t in extracted.emotional_triggers if t not in existing_triggers]
             triggers_data["triggers"] = list(existing_triggers) + new_triggers
-            triggers_data["last_updated"] = datetime.now().isoformat()
+            triggers_data["last_updated"] = now_iso
 
-            await self.memory_backends.save_long_term_memory(
+            saves.append(self.memory_backends.save_long_term_memory(
                 child_id=child_id,
                 memory_type="triggers_and_responses",
                 key="emotional_triggers",
                 data=triggers_data
-            )
+            ))
             logger.info(f"[MEMORY] Added {len(new_triggers)} emotional triggers")
 
         # Save updated main memory
-        await self.memory_backends.save_long_term_memory(
+        saves.append(self.memory_backends.save_long_term_memory(
             child_id=child_id,
             memory_type="behavioral_patterns",
             key="main",
             data=child_memory.to_dict()
-        )
+        ))
+        await asyncio.gather(*saves)
 
     async def _extract_memory_with_llm(self, concern: str, behavior_analysis: str) -> ExtractedMemory:
         """
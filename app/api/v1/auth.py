@@ -1,9 +1,9 @@
 """Authentication API endpoints."""
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.database.session import get_db
+from app.database.queries import user_by_id, user_by_email, user_by_firebase_uid
 from app.models.user import User
 from app.schemas.auth import UserRegister, UserLogin, Token, TokenRefresh, UserResponse, FirebaseAuth
 from app.utils.security import (
@@ -39,7 +39,7 @@ async def register(
     """
     # Check if email already exists
     result = await db.execute(
-        select(User).where(User.email == user_data.email)
+        user_by_email(user_data.email)
     )
     existing_user = result.scalar_one_or_none()
 
@@ -85,7 +85,7 @@ async def login(
     """
     # Get user by email
     result = await db.execute(
-        select(User).where(User.email == credentials.email)
+        user_by_email(credentials.email)
     )
     user = result.scalar_one_or_none()
 
@@ -151,7 +151,7 @@ async def refresh_token(
 
         # Verify user exists and is active
         result = await db.execute(
-            select(User).where(User.id == int(user_id))
+            user_by_id(int(user_id))
         )
         user = result.scalar_one_or_none()
 
@@ -237,14 +237,14 @@ async def firebase_auth(
 
     # Check if user exists by firebase_uid
     result = await db.execute(
-        select(User).where(User.firebase_uid == firebase_uid)
+        user_by_firebase_uid(firebase_uid)
     )
     user = result.scalar_one_or_none()
 
     if user is None:
         # Check if user exists by email (for linking accounts)
         result = await db.execute(
-            select(User).where(User.email == email)
+            user_by_email(email)
         )
         user = result.scalar_one_or_none()
 
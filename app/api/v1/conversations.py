@@ -1,17 +1,19 @@
 """Conversation API endpoints."""
-import json
 import logging
 from typing import List, Optional, AsyncGenerator
+
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
+from sqlalchemy.orm import undefer
 
 from app.database.session import get_db
+from app.database.queries import messages_for_conversation
 from app.models.user import User
 from app.models.child import Child
 from app.models.conversation import Conversation
-from app.models.message import Message
 from app.schemas.conversation import (
     ConversationCreate,
     ConversationResponse,
@@ -21,11 +23,22 @@ from app.schemas.conversation import (
     MessageSendResponse
 )
 from app.dependencies import get_current_user
-from app.services.agent_service import AgentService
+from app.services.agent_service import agent_service
+from app.services.title_worker import is_placeholder_title, title_worker
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# SSE framing for token events; only the token itself is encoded per event
+_TOKEN_EVENT_PREFIX = b'event: token\ndata: {"content":'
+_TOKEN_EVENT_SUFFIX = b'}\n\n'
+
+
+def _retry_title(conversation: Conversation) -> None:
+    """Queue a title for a conversation still on its placeholder after the first exchange."""
+    if conversation.first_exchange_done and is_placeholder_title(conversation.title):
+        title_worker.enqueue(conversation.id)
+
 
 @router.post("", response_model=ConversationResponse, status_code=status.HTTP_201_CREATED)
 async def create_conversation(
@@ -66,7 +79,6 @@ async def create_conversation(
         )
 
     # Create conversation using agent service
-    agent_service = AgentService()
     conversation = await agent_service.create_conversation(
         db=db,
         child_id=conversation_data.child_id,
@@ -102,8 +114,16 @@ async def list_conversations(
     Returns:
         List of conversations
     """
-    # Build query
-    query = select(Conversation).join(Child).where(Child.parent_id == current_user.id)
+    # Build query; message counts come back in the same round trip
+    query = (
+        select(Conversation)
+        .join(Child)
+        .where(Child.parent_id == current_user.id)
+        .options(
+            undefer(Conversation.message_count),
+            undefer(Conversation.last_message_at)
+        )
+    )
 
     if child_id:
         # Verify child belongs to user
@@ -120,21 +140,29 @@ async def list_conversations(
 
         query = query.where(Conversation.child_id == child_id)
 
-    # Order by most recent
-    query = query.order_by(desc(Conversation.updated_at))
+    # Order by most recent activity; reported below as updated_at, so the
+    # list order and the timestamps the client groups by always agree
+    query = query.order_by(desc(Conversation.last_message_at))
 
     result = await db.execute(query)
     conversations = result.scalars().all()
 
+    # Titles lost from the in-memory queue (restart, failure) are retried
+    for conv in conversations:
+        _retry_title(conv)
+
+    # Rows come straight from the database; FastAPI validates the
+    # response_model on the way out, so skip the extra validation here
     return [
-        ConversationResponse(
+        ConversationResponse.model_construct(
             id=conv.id,
             child_id=conv.child_id,
             thread_id=conv.thread_id,
             title=conv.title,
             is_active=conv.is_active,
             created_at=conv.created_at.isoformat(),
-            updated_at=conv.updated_at.isoformat()
+            updated_at=conv.last_message_at.isoformat(),
+            message_count=conv.message_count
         )
         for conv in conversations
     ]
@@ -144,6 +172,7 @@ async def list_conversations(
 async def get_conversation(
     conversation_id: int,
     limit: int = Query(50, ge=1, le=200, description="Maximum messages to return"),
+    after_id: Optional[int] = Query(None, ge=0, description="Return messages after this message ID"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -153,6 +182,7 @@ async def get_conversation(
     Args:
         conversation_id: Conversation ID
         limit: Maximum number of messages to return
+        after_id: Last message ID already seen, for paging through history
         current_user: Current authenticated user
         db: Database session
 
@@ -162,38 +192,36 @@ async def get_conversation(
     Raises:
         HTTPException: If conversation not found or not owned by user
     """
-    # Get conversation
+    # Get conversation and its owner in one query
     result = await db.execute(
-        select(Conversation).where(Conversation.id == conversation_id)
+        select(Conversation, Child.parent_id)
+        .join(Conversation.child)
+        .where(Conversation.id == conversation_id)
+        .options(undefer(Conversation.last_message_at))
     )
-    conversation = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not conversation:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Conversation not found"
         )
 
     # Verify ownership through child
-    child_result = await db.execute(
-        select(Child).where(Child.id == conversation.child_id)
-    )
-    child = child_result.scalar_one_or_none()
-
-    if not child or child.parent_id != current_user.id:
+    conversation, parent_id = row
+    if parent_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this conversation"
         )
 
+    _retry_title(conversation)
+
     # Get messages - order by id (more reliable than timestamp)
     messages_result = await db.execute(
-        select(Message)
-        .where(Message.conversation_id == conversation_id)
-        .order_by(Message.id.asc())
-        .limit(limit)
+        messages_for_conversation(conversation_id, limit, after_id)
     )
-    messages = messages_result.scalars().all()
+    messages = messages_result.all()
 
     return ConversationWithMessages(
         id=conversation.id,
@@ -202,9 +230,10 @@ async def get_conversation(
         title=conversation.title,
         is_active=conversation.is_active,
         created_at=conversation.created_at.isoformat(),
-        updated_at=conversation.updated_at.isoformat(),
+        updated_at=conversation.last_message_at.isoformat(),
+        # Trusted rows; validated once by the response_model
         messages=[
-            MessageResponse(
+            MessageResponse.model_construct(
                 id=msg.id,
                 role=msg.role,
                 content=msg.content,
@@ -241,13 +270,12 @@ async def send_message(
     Raises:
         HTTPException: If conversation not found or not owned by user
     """
-    # Get conversation
-    result = await db.execute(
-        select(Conversation).where(Conversation.id == conversation_id)
-    )
-    conversation = result.scalar_one_or_none()
-
-    if not conversation:
+    # Get conversation and verify ownership in one query; the service reuses it
+    try:
+        conversation = await agent_service.get_owned_conversation(
+            db, conversation_id, current_user.id
+        )
+    except PermissionError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Conversation not found"
@@ -259,27 +287,14 @@ async def send_message(
             detail="Conversation is not active"
         )
 
-    # Verify ownership through child
-    child_result = await db.execute(
-        select(Child).where(Child.id == conversation.child_id)
-    )
-    child = child_result.scalar_one_or_none()
-
-    if not child or child.parent_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to send messages in this conversation"
-        )
-
     # Process message through agent workflow
-    agent_service = AgentService()
-
     try:
         response = await agent_service.send_message(
             db=db,
             conversation_id=conversation_id,
             user_id=current_user.id,
-            content=message_data.content
+            content=message_data.content,
+            conversation=conversation
         )
 
         return MessageSendResponse(
@@ -287,7 +302,8 @@ async def send_message(
             content=response["content"],
             requires_human_review=response["requires_human_review"],
             safety_flags=response["safety_flags"],
-            metadata=response["metadata"]
+            metadata=response["metadata"],
+            title_pending=response["title_pending"]
         )
 
     except Exception as e:
@@ -325,13 +341,12 @@ async def send_message_stream(
     Returns:
         StreamingResponse with SSE events
     """
-    # Get conversation
-    result = await db.execute(
-        select(Conversation).where(Conversation.id == conversation_id)
-    )
-    conversation = result.scalar_one_or_none()
-
-    if not conversation:
+    # Get conversation and verify ownership in one query; the service reuses it
+    try:
+        conversation = await agent_service.get_owned_conversation(
+            db, conversation_id, current_user.id
+        )
+    except PermissionError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Conversation not found"
@@ -343,37 +358,27 @@ async def send_message_stream(
             detail="Conversation is not active"
         )
 
-    # Verify ownership through child
-    child_result = await db.execute(
-        select(Child).where(Child.id == conversation.child_id)
-    )
-    child = child_result.scalar_one_or_none()
-
-    if not child or child.parent_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to send messages in this conversation"
-        )
-
-    async def event_generator() -> AsyncGenerator[str, None]:
+    async def event_generator() -> AsyncGenerator[bytes, None]:
         """Generate SSE events for the streaming response."""
-        agent_service = AgentService()
-
         try:
             async for event in agent_service.send_message_stream(
                 db=db,
                 conversation_id=conversation_id,
                 user_id=current_user.id,
-                content=message_data.content
+                content=message_data.content,
+                conversation=conversation
             ):
+                if isinstance(event, str):
+                    yield _TOKEN_EVENT_PREFIX + orjson.dumps(event) + _TOKEN_EVENT_SUFFIX
+                    continue
                 event_type = event.get("type", "token")
-                data = json.dumps(event.get("data", {}))
-                yield f"event: {event_type}\ndata: {data}\n\n"
+                data = orjson.dumps(event.get("data", {}))
+                yield b"event: " + event_type.encode() + b"\ndata: " + data + b"\n\n"
 
         except Exception as e:
             logger.error(f"Streaming error: {str(e)}", exc_info=True)
-            error_data = json.dumps({"error": str(e)})
-            yield f"event: error\ndata: {error_data}\n\n"
+            error_data = orjson.dumps({"error": str(e)})
+            yield b"event: error\ndata: " + error_data + b"\n\n"
 
     return StreamingResponse(
         event_generator(),
@@ -403,25 +408,23 @@ async def delete_conversation(
     Raises:
         HTTPException: If conversation not found or not owned by user
     """
-    # Get conversation
+    # Get conversation and its owner in one query
     result = await db.execute(
-        select(Conversation).where(Conversation.id == conversation_id)
+        select(Conversation, Child.parent_id)
+        .join(Conversation.child)
+        .where(Conversation.id == conversation_id)
     )
-    conversation = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not conversation:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Conversation not found"
         )
 
     # Verify ownership through child
-    child_result = await db.execute(
-        select(Child).where(Child.id == conversation.child_id)
-    )
-    child = child_result.scalar_one_or_none()
-
-    if not child or child.parent_id != current_user.id:
+    conversation, parent_id = row
+    if parent_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to delete this conversation"
@@ -8,8 +8,7 @@ from app.models.user import User
 from app.models.child import Child
 from app.database.session import get_db
 from app.memory.manager import MemoryManager
-from app.memory.backends import MemoryBackends
-from app.config import settings
+from app.memory.backends import get_memory_backends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
@@ -65,12 +64,8 @@ class MemorySearchResponse(BaseModel):
 
 
 async def get_memory_manager() -> MemoryManager:
-    """Get memory manager instance."""
-    backends = MemoryBackends(
-        database_url=settings.database_url,
-        use_semantic_search=True
-    )
-    return MemoryManager(backends)
+    """Get memory manager on the shared backends (one pool per process)."""
+    return MemoryManager(get_memory_backends())
 
 
 async def verify_child_ownership(
@@ -0,0 +1,42 @@
+"""Add composite indexes for conversation and child listings
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_conv_user_active', 'conversations', ['user_id', 'is_active'])
+    op.create_index(
+        'ix_conv_child_active_created',
+        'conversations',
+        ['child_id', 'is_active', 'created_at']
+    )
+    op.create_index('ix_child_parent_dob', 'children', ['parent_id', 'date_of_birth'])
+
+    # Single-column FK indexes are now covered by the composite prefixes.
+    # ix_conversations_child_id only exists on databases built via create_all.
+    op.drop_index('ix_conversations_user_id', table_name='conversations')
+    op.drop_index('ix_conversations_child_id', table_name='conversations', if_exists=True)
+    op.drop_index('ix_children_parent_id', table_name='children')
+
+
+def downgrade() -> None:
+    op.create_index('ix_children_parent_id', 'children', ['parent_id'])
+    op.create_index('ix_conversations_user_id', 'conversations', ['user_id'])
+
+    op.drop_index('ix_child_parent_dob', table_name='children')
+    op.drop_index('ix_conv_child_active_created', table_name='conversations')
+    op.drop_index('ix_conv_user_active', table_name='conversations')
@@ -0,0 +1,27 @@
+"""Add composite index for ordered message history
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_messages_conv_id', 'messages', ['conversation_id', 'id'])
+    op.drop_index('ix_messages_conversation_id', table_name='messages')
+
+
+def downgrade() -> None:
+    op.create_index('ix_messages_conversation_id', 'messages', ['conversation_id'])
+    op.drop_index('ix_messages_conv_id', table_name='messages')
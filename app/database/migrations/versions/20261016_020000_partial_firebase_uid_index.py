@@ -0,0 +1,34 @@
+"""Make the firebase_uid unique index partial
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_users_firebase_uid', table_name='users')
+    op.create_index(
+        'ix_users_firebase_uid',
+        'users',
+        ['firebase_uid'],
+        unique=True,
+        postgresql_where=sa.text('firebase_uid IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_firebase_uid', table_name='users')
+    op.create_index('ix_users_firebase_uid', 'users', ['firebase_uid'], unique=True)
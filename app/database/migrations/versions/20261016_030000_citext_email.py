@@ -0,0 +1,41 @@
+"""Store user emails as CITEXT
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-16 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+    # Rebuilds ix_users_email; fails if two accounts differ only by case
+    op.alter_column(
+        'users',
+        'email',
+        type_=postgresql.CITEXT(),
+        existing_type=sa.String(length=255),
+        existing_nullable=False
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'users',
+        'email',
+        type_=sa.String(length=255),
+        existing_type=postgresql.CITEXT(),
+        existing_nullable=False
+    )
@@ -0,0 +1,45 @@
+"""Store message roles as a native enum
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+message_role = postgresql.ENUM('user', 'assistant', 'system', name='message_role')
+
+
+def upgrade() -> None:
+    message_role.create(op.get_bind(), checkfirst=True)
+    op.alter_column(
+        'messages',
+        'role',
+        type_=message_role,
+        existing_type=sa.String(length=50),
+        existing_nullable=False,
+        postgresql_using='role::message_role'
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'messages',
+        'role',
+        type_=sa.String(length=50),
+        existing_type=message_role,
+        existing_nullable=False,
+        postgresql_using='role::text'
+    )
+    message_role.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,40 @@
+"""Track whether a conversation's first exchange has completed
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16 05:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'conversations',
+        sa.Column('first_exchange_done', sa.Boolean(), server_default=sa.false(), nullable=False)
+    )
+    # Conversations that already have an assistant reply are past their first exchange
+    op.execute(
+        """
+        UPDATE conversations SET first_exchange_done = true
+        WHERE EXISTS (
+            SELECT 1 FROM messages
+            WHERE messages.conversation_id = conversations.id
+              AND messages.role = 'assistant'
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('conversations', 'first_exchange_done')
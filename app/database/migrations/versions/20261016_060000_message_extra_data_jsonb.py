@@ -0,0 +1,54 @@
+"""Store message metadata as JSONB
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16 06:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Older rows hold Python repr() text rather than JSON; keep those under "raw"
+    op.execute(
+        """
+        CREATE FUNCTION _try_jsonb(value text) RETURNS jsonb AS $$
+        BEGIN
+            RETURN value::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN jsonb_build_object('raw', value);
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE
+        """
+    )
+    op.alter_column(
+        'messages',
+        'extra_data',
+        type_=postgresql.JSONB(),
+        existing_type=sa.Text(),
+        existing_nullable=True,
+        postgresql_using='_try_jsonb(extra_data)'
+    )
+    op.execute("DROP FUNCTION _try_jsonb(text)")
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'messages',
+        'extra_data',
+        type_=sa.Text(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='extra_data::text'
+    )
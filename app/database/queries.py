@@ -0,0 +1,130 @@
+"""Cached statements for hot-path lookups.
+
+Each builder returns a ``lambda_stmt``. SQLAlchemy caches the constructed
+statement and its compiled form keyed on the lambda's code object, and
+closure variables become bound parameters, so repeated calls skip both
+statement construction and SQL compilation.
+"""
+from typing import Optional
+
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import contains_eager, lazyload
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from app.models.child import Child
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.user import User
+
+
+def user_by_id(user_id: int) -> StatementLambdaElement:
+    """
+    Select a user by primary key without loading children.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Cached statement
+    """
+    return lambda_stmt(
+        lambda: select(User).where(User.id == user_id).options(lazyload(User.children))
+    )
+
+
+def user_by_email(email: str) -> StatementLambdaElement:
+    """
+    Select a user by email without loading children.
+
+    Args:
+        email: Email address
+
+    Returns:
+        Cached statement
+    """
+    return lambda_stmt(
+        lambda: select(User).where(User.email == email).options(lazyload(User.children))
+    )
+
+
+def user_by_firebase_uid(firebase_uid: str) -> StatementLambdaElement:
+    """
+    Select a user by Firebase UID without loading children.
+
+    Args:
+        firebase_uid: Firebase user UID
+
+    Returns:
+        Cached statement
+    """
+    return lambda_stmt(
+        lambda: select(User)
+        .where(User.firebase_uid == firebase_uid)
+        .options(lazyload(User.children))
+    )
+
+
+def owned_child(child_id: int, user_id: int) -> StatementLambdaElement:
+    """
+    Select a child only if it belongs to the given parent.
+
+    Args:
+        child_id: Child ID
+        user_id: Parent user ID
+
+    Returns:
+        Cached statement
+    """
+    return lambda_stmt(
+        lambda: select(Child).where(Child.id == child_id, Child.parent_id == user_id)
+    )
+
+
+def owned_conversation(conversation_id: int, user_id: int) -> StatementLambdaElement:
+    """
+    Select a conversation with its child populated, only if the parent owns it.
+
+    Args:
+        conversation_id: Conversation ID
+        user_id: Parent user ID
+
+    Returns:
+        Cached statement
+    """
+    return lambda_stmt(
+        lambda: select(Conversation)
+        .join(Conversation.child)
+        .options(contains_eager(Conversation.child))
+        .where(Conversation.id == conversation_id, Child.parent_id == user_id)
+    )
+
+
+def messages_for_conversation(
+    conversation_id: int,
+    limit: int,
+    after_id: Optional[int] = None
+) -> StatementLambdaElement:
+    """
+    Select a conversation's messages in insertion order as plain rows.
+
+    Only the columns the history views render are selected, so results are
+    lightweight Row tuples rather than ORM instances. Pages are keyset-based:
+    passing the last seen id seeks straight to the next page on the
+    (conversation_id, id) index instead of scanning past an offset.
+
+    Args:
+        conversation_id: Conversation ID
+        limit: Maximum messages to return
+        after_id: Only return messages with a greater id
+
+    Returns:
+        Cached statement yielding (id, role, content, created_at) rows
+    """
+    stmt = lambda_stmt(
+        lambda: select(Message.id, Message.role, Message.content, Message.created_at)
+        .where(Message.conversation_id == conversation_id)
+    )
+    if after_id is not None:
+        stmt += lambda s: s.where(Message.id > after_id)
+    stmt += lambda s: s.order_by(Message.id.asc()).limit(limit)
+    return stmt
@@ -1,21 +1,43 @@
 """Database session management."""
-from typing import AsyncGenerator
+import logging
+from typing import Any, AsyncGenerator
 
+import orjson
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine
 )
+from sqlalchemy.orm import ORMExecuteState, Session
 
 from app.config import settings
 
-# Create async engine
+logger = logging.getLogger(__name__)
+
+
+def _json_serializer(obj: Any) -> str:
+    """Encode JSON/JSONB column values with orjson; unknown types fall back to str()."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+# Create async engine. Connections are recycled before server-side idle
+# timeouts instead of being pinged with an extra round trip per checkout.
+# The hot queries are textually identical per request, so both asyncpg's and
+# SQLAlchemy's statement caches are sized to keep them prepared.
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_pre_ping=False,
+    pool_recycle=1800,
+    pool_size=20,
+    max_overflow=10,
+    query_cache_size=1200,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+    connect_args={
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    }
 )
 
 # Create session factory
@@ -28,6 +50,14 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+if settings.debug:
+    @event.listens_for(Session, "do_orm_execute")
+    def _count_queries(orm_execute_state: ORMExecuteState) -> None:
+        """Count statements per session so query regressions show up in dev logs."""
+        info = orm_execute_state.session.info
+        info["query_count"] = info.get("query_count", 0) + 1
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting database session.
@@ -45,6 +75,8 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
             raise
         finally:
+            if settings.debug:
+                logger.debug(f"[DB] Session issued {session.info.get('query_count', 0)} queries")
             await session.close()
 
 
@@ -55,6 +87,8 @@ async def init_db() -> None:
     from app.models import user, child, conversation, message
 
     async with engine.begin() as conn:
+        # users.email is CITEXT
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS citext"))
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
 
@@ -3,11 +3,11 @@ import logging
 from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError
+from jwt import PyJWTError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.database.session import get_db
+from app.database.queries import user_by_id, user_by_email, user_by_firebase_uid
 from app.models.user import User
 from app.utils.security import decode_token
 from app.services.firebase import verify_firebase_token
@@ -59,14 +59,14 @@ async def get_current_user(
         # Look up user by firebase_uid or email
         if firebase_uid:
             result = await db.execute(
-                select(User).where(User.firebase_uid == firebase_uid)
+                user_by_firebase_uid(firebase_uid)
             )
             user = result.scalar_one_or_none()
 
             if user is None and email:
                 # Try to find by email and link Firebase account
                 result = await db.execute(
-                    select(User).where(User.email == email)
+                    user_by_email(email)
                 )
                 user = result.scalar_one_or_none()
                 if user:
@@ -98,7 +98,7 @@ async def get_current_user(
             logger.warning("JWT payload missing 'sub' claim")
             raise credentials_exception
 
-    except JWTError as e:
+    except PyJWTError as e:
         logger.error(f"JWT decode error: {type(e).__name__}: {e}")
         raise credentials_exception
     except Exception as e:
@@ -107,7 +107,7 @@ async def get_current_user(
 
     # Get user from database by ID
     result = await db.execute(
-        select(User).where(User.id == int(user_id))
+        user_by_id(int(user_id))
     )
     user = result.scalar_one_or_none()
 
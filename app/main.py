@@ -5,7 +5,7 @@ from typing import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 
 from app.config import settings
 
@@ -48,10 +48,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         os.environ["LANGCHAIN_PROJECT"] = settings.langsmith_project
         logger.info("LangSmith tracing enabled")
 
+    # Compile the LangGraph workflows before the first request
+    from app.workflow.graph import get_compiled_workflow, get_compiled_analysis_workflow
+    get_compiled_workflow()
+    get_compiled_analysis_workflow()
+
+    # Start background title generation
+    from app.services.title_worker import title_worker
+    title_worker.start(settings.title_workers)
+
     yield
 
     # Shutdown
     logger.info(f"Shutting down {settings.app_name}")
+    await title_worker.stop()
+
+    # Release the memory store/checkpointer pool
+    from app.memory.backends import get_memory_backends
+    await get_memory_backends().close()
     # TODO: Close database connections
     # TODO: Close Redis connections
 
@@ -63,6 +77,8 @@ app = FastAPI(
     version=settings.api_version,
     debug=settings.debug,
     lifespan=lifespan,
+    # orjson renders responses several times faster than the stdlib encoder
+    default_response_class=ORJSONResponse,
     docs_url=f"/api/{settings.api_version}/docs",
     redoc_url=f"/api/{settings.api_version}/redoc",
     openapi_url=f"/api/{settings.api_version}/openapi.json"
@@ -106,7 +122,7 @@ async def root():
 async def global_exception_handler(request, exc):
     """Global exception handler."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal server error",
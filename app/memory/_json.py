@@ -0,0 +1,41 @@
+"""Fast JSON encoding for long-term memory payloads."""
+from typing import Any
+
+import orjson
+
+# Match stdlib json's tolerance for non-string dict keys
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to JSON bytes.
+
+    Args:
+        obj: JSON-compatible object (datetimes are emitted as ISO-8601)
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(obj, option=_DUMPS_OPTIONS)
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Deserialize JSON bytes or text.
+
+    Args:
+        data: Encoded JSON document
+
+    Returns:
+        Decoded Python object
+    """
+    return orjson.loads(data)
+
+
+def register_psycopg_json() -> None:
+    """Make psycopg encode and decode json/jsonb values with orjson."""
+    from psycopg.types.json import set_json_dumps, set_json_loads
+
+    set_json_dumps(dumps)
+    set_json_loads(loads)
@@ -1,15 +1,31 @@
 """Memory backend configuration for dual-layer memory system."""
 import asyncio
+import heapq
 import logging
-from typing import Any, Dict, Optional, List
-from langgraph.store.base import BaseStore
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Optional, List, Tuple
+from langgraph.store.base import BaseStore, PutOp
 from langgraph.store.postgres.aio import AsyncPostgresStore
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from langchain_openai import AzureOpenAIEmbeddings
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 from app.config import settings
+from app.memory._json import register_psycopg_json
 
 logger = logging.getLogger(__name__)
 
+# Long-term memory namespaces kept per child
+MEMORY_TYPES: Tuple[str, ...] = (
+    "behavioral_patterns",
+    "developmental_history",
+    "successful_interventions",
+    "triggers_and_responses",
+    "timeline_events",
+    "family_context"
+)
+
 # Singleton instance - will be initialized on first use
 _memory_backends_instance: "MemoryBackends | None" = None
 
@@ -22,6 +38,27 @@ def get_memory_backends() -> "MemoryBackends":
     return _memory_backends_instance
 
 
+def _project_columns(
+    items: List[Dict[str, Any]],
+    columns: Dict[str, Any]
+) -> Dict[str, List[Any]]:
+    """
+    Project search results into one list per requested field.
+
+    Args:
+        items: Results from search_memories
+        columns: Field name to the default used when an item lacks it
+
+    Returns:
+        Mapping of field name to column values
+    """
+    data = [item["data"] for item in items]
+    return {
+        column: [value.get(column, default) for value in data]
+        for column, default in columns.items()
+    }
+
+
 class MemoryBackends:
     """
     Memory backend manager for dual-layer memory:
@@ -39,32 +76,67 @@ class MemoryBackends:
         Initialize memory backends.
 
         Args:
-            database_url: PostgreSQL connection URL
+            database_url: PostgreSQL connection URL or libpq string; a
+                SQLAlchemy driver suffix (postgresql+asyncpg://) is dropped
+                since psycopg can't parse it
             use_semantic_search: Enable semantic search in store
             embeddings_model: Embeddings model for semantic search
         """
+        scheme, sep, rest = database_url.partition("://")
+        if sep and "+" in scheme:
+            database_url = f"{scheme.split('+', 1)[0]}://{rest}"
         self.database_url = database_url
         self.use_semantic_search = use_semantic_search
         self.embeddings_model = embeddings_model
+        self._pool: AsyncConnectionPool | None = None  # Shared by store and checkpointer
         self._checkpointer = None
         self._store = None
-        self._store_cm = None  # Store the context manager for cleanup
         self._store_lock: asyncio.Lock | None = None  # Created lazily in async context
         self._store_initialized = False
 
+    async def _open_pool(self) -> AsyncConnectionPool:
+        """
+        Open the shared connection pool on first use.
+
+        Callers must hold the store lock.
+
+        Returns:
+            Open AsyncConnectionPool
+        """
+        if self._pool is None:
+            # Same connection settings the from_conn_string helpers use
+            pool = AsyncConnectionPool(
+                self.database_url,
+                max_size=settings.memory_pool_max_size,
+                kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+                open=False
+            )
+            await pool.open()
+            self._pool = pool
+            logger.info("[MEMORY] Connection pool opened")
+        return self._pool
+
     async def get_checkpointer(self) -> AsyncPostgresSaver:
         """
         Get PostgreSQL checkpointer for short-term memory (conversation state).
 
+        Created once on the shared pool; setup() only runs the first time.
+
         Returns:
             AsyncPostgresSaver instance
         """
-        if self._checkpointer is None:
-            self._checkpointer = AsyncPostgresSaver.from_conn_string(
-                self.database_url
-            )
-            # Initialize checkpointer tables (only needed first time)
-            await self._checkpointer.setup()
+        if self._checkpointer is not None:
+            return self._checkpointer
+
+        if self._store_lock is None:
+            self._store_lock = asyncio.Lock()
+
+        async with self._store_lock:
+            if self._checkpointer is None:
+                checkpointer = AsyncPostgresSaver(await self._open_pool())
+                # Initialize checkpointer tables (only needed first time)
+                await checkpointer.setup()
+                self._checkpointer = checkpointer
 
         return self._checkpointer
 
@@ -97,8 +169,11 @@ class MemoryBackends:
 
             logger.info("[MEMORY] Initializing AsyncPostgresStore...")
 
-            # Convert SQLAlchemy URL to libpq format for AsyncPostgresStore
-            conn_string = settings.postgres_connection_string
+            # Pooled connections let concurrent store calls run in parallel
+            pool = await self._open_pool()
+
+            # The store wraps every value in psycopg's Jsonb adapter
+            register_psycopg_json()
 
             if self.use_semantic_search:
                 # Initialize embeddings for semantic search
@@ -111,10 +186,8 @@ class MemoryBackends:
                     dimensions=1536  # Reduce from 3072 to fit HNSW index limit
                 )
 
-                # AsyncPostgresStore returns an async context manager
-                # We need to enter it and store both the CM and the store
-                self._store_cm = AsyncPostgresStore.from_conn_string(
-                    conn_string,
+                self._store = AsyncPostgresStore(
+                    pool,
                     index={
                         "embed": embeddings,
                         "dims": 1536,  # Reduced to fit pgvector HNSW limit (max 2000)
@@ -123,12 +196,7 @@ class MemoryBackends:
                 )
             else:
                 # AsyncPostgresStore without semantic search
-                self._store_cm = AsyncPostgresStore.from_conn_string(conn_string)
-
-            # Enter the async context manager to get the actual store
-            logger.info("[MEMORY] Entering context manager...")
-            self._store = await self._store_cm.__aenter__()
-            logger.info("[MEMORY] Context manager entered")
+                self._store = AsyncPostgresStore(pool)
 
             # Setup creates required tables if they don't exist
             logger.info("[MEMORY] Running AsyncPostgresStore setup...")
@@ -236,27 +304,21 @@ class MemoryBackends:
         store = await self.get_store()
 
         # Default memory types
-        types_to_search = memory_types or [
-            "behavioral_patterns",
-            "developmental_history",
-            "successful_interventions",
-            "triggers_and_responses",
-            "timeline_events",
-            "family_context"
-        ]
-
-        results = []
-        for memory_type in types_to_search:
-            namespace = (f"child_{child_id}", memory_type)
+        types_to_search = memory_types or MEMORY_TYPES
 
-            # Perform semantic search
-            items = await store.asearch(
-                namespace,
+        # Namespaces are independent, so run the semantic searches concurrently
+        per_type_items = await asyncio.gather(*(
+            store.asearch(
+                (f"child_{child_id}", memory_type),
                 query=query,
                 limit=limit,
                 filter=filter_dict
             )
+            for memory_type in types_to_search
+        ))
 
+        results = []
+        for memory_type, items in zip(types_to_search, per_type_items):
             for item in items:
                 results.append({
                     "memory_type": memory_type,
@@ -269,6 +331,77 @@ class MemoryBackends:
 
         return results
 
+    async def aggregate_patterns(
+        self,
+        child_id: int,
+        query: str,
+        since: datetime,
+        limit_recent: int = 10,
+        midpoint: Optional[datetime] = None,
+        limit: int = 50
+    ) -> Tuple[int, int, int, Dict[str, int], List[Dict[str, Any]]]:
+        """
+        Aggregate behavioral patterns observed since a cutoff in one pass.
+
+        Runs a single semantic search and folds the results into counts
+        without materialising intermediate lists in the caller.
+
+        Args:
+            child_id: Child's ID
+            query: Search query used to select relevant patterns
+            since: Only patterns last observed at or after this are "recent"
+            limit_recent: Maximum recent items to return
+            midpoint: Optional second cutoff used for trend calculation
+            limit: Maximum patterns to consider
+
+        Returns:
+            Tuple of (total, recent_count, newer_than_midpoint,
+            frequency_histogram, top_recent)
+        """
+        patterns = await self.search_memories(
+            child_id=child_id,
+            query=query,
+            memory_types=["behavioral_patterns"],
+            limit=limit
+        )
+
+        # Timestamps are stored as ISO-8601 strings, which order
+        # lexicographically, so compare them without parsing
+        since_iso = since.isoformat()
+        midpoint_iso = midpoint.isoformat() if midpoint is not None else None
+
+        # Only two fields take part in the aggregation, so scan them as columns.
+        # A missing last_observed sorts before any cutoff.
+        columns = _project_columns(patterns, {"last_observed": "", "frequency": "unknown"})
+        last_observed_col = columns["last_observed"]
+        frequency_col = columns["frequency"]
+
+        recent_idx = [
+            i for i, last_observed in enumerate(last_observed_col)
+            if last_observed >= since_iso
+        ]
+
+        frequency_counts = Counter(frequency_col[i] for i in recent_idx)
+
+        newer_than_midpoint = 0
+        if midpoint_iso is not None:
+            newer_than_midpoint = sum(
+                1 for i in recent_idx if last_observed_col[i] >= midpoint_iso
+            )
+
+        # Only the newest few are returned, so avoid sorting the whole set
+        top_idx = heapq.nlargest(
+            limit_recent, recent_idx, key=last_observed_col.__getitem__
+        )
+
+        return (
+            len(patterns),
+            len(recent_idx),
+            newer_than_midpoint,
+            dict(frequency_counts),
+            [patterns[i] for i in top_idx]
+        )
+
     async def delete_memory(
         self,
         child_id: int,
@@ -287,44 +420,50 @@ class MemoryBackends:
         namespace = (f"child_{child_id}", memory_type)
         await store.adelete(namespace, key)
 
-    async def delete_all_child_memories(self, child_id: int) -> None:
+    async def delete_memory_type(self, child_id: int, memory_type: str) -> None:
         """
-        Delete all memories for a child (GDPR compliance).
+        Delete every item in one memory namespace for a child.
 
         Args:
             child_id: Child's ID
+            memory_type: Type of memory
         """
         store = await self.get_store()
+        namespace = (f"child_{child_id}", memory_type)
 
-        memory_types = [
-            "behavioral_patterns",
-            "developmental_history",
-            "successful_interventions",
-            "triggers_and_responses",
-            "timeline_events",
-            "family_context"
-        ]
-
-        for memory_type in memory_types:
-            namespace = (f"child_{child_id}", memory_type)
-            # List all items and delete them
+        while True:
             items = await store.asearch(namespace, limit=1000)
-            for item in items:
-                await store.adelete(namespace, item.key)
+            if not items:
+                break
+            # A PutOp without a value deletes the key; batch them in one call
+            await store.abatch([
+                PutOp(namespace=namespace, key=item.key, value=None)
+                for item in items
+            ])
+
+    async def delete_all_child_memories(self, child_id: int) -> None:
+        """
+        Delete all memories for a child (GDPR compliance).
+
+        Args:
+            child_id: Child's ID
+        """
+        await asyncio.gather(*(
+            self.delete_memory_type(child_id, memory_type)
+            for memory_type in MEMORY_TYPES
+        ))
 
     async def close(self) -> None:
         """Close all connections."""
-        if self._checkpointer:
-            # AsyncPostgresSaver handles cleanup automatically
-            pass
-
-        if self._store_cm:
-            # Exit the async context manager to close connections
+        if self._pool:
+            # Store and checkpointer share the pool; closing it releases both
             try:
-                await self._store_cm.__aexit__(None, None, None)
-                logger.info("[MEMORY] AsyncPostgresStore connection closed")
+                await self._pool.close()
+                logger.info("[MEMORY] Connection pool closed")
             except Exception as e:
-                logger.error(f"[MEMORY] Error closing store: {e}")
+                logger.error(f"[MEMORY] Error closing connection pool: {e}")
             finally:
+                self._pool = None
                 self._store = None
-                self._store_cm = None
+                self._checkpointer = None
+                self._store_initialized = False
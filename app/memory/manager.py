@@ -1,8 +1,9 @@
 """Memory management utilities and tools for child behavioral therapist system."""
-import uuid
+import asyncio
+import os
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-from collections import defaultdict
 
 from app.memory.backends import MemoryBackends
 from app.memory.schemas import (
@@ -15,6 +16,23 @@ from app.memory.schemas import (
 )
 
 
+def _new_memory_key() -> str:
+    """
+    Generate a time-ordered UUIDv7 key as 32 hex characters.
+
+    Keys sort by creation time, so new items land at the end of the
+    store's key index instead of at random positions.
+
+    Returns:
+        Hex-encoded UUIDv7
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    # Set version (7) and RFC 4122 variant bits
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return f"{value:032x}"
+
+
 class MemoryManager:
     """
     High-level memory management for child behavioral analysis.
@@ -43,7 +61,8 @@ class MemoryManager:
         frequency: str,
         triggers: List[str],
         severity: str = "mild",
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        validate: bool = False
     ) -> str:
         """
         Add a new behavioral pattern observation.
@@ -56,33 +75,73 @@ class MemoryManager:
             triggers: Known triggers
             severity: Severity level (mild, moderate, severe)
             notes: Additional notes
+            validate: Run the payload through BehavioralPattern before saving
 
         Returns:
             Pattern ID (key)
         """
-        pattern_id = str(uuid.uuid4())
-        now = datetime.now()
+        pattern_id = _new_memory_key()
 
-        pattern = BehavioralPattern(
+        data = self._make_pattern_dict(
             behavior=behavior,
             context=context,
             frequency=frequency,
             triggers=triggers,
             severity=severity,
-            first_observed=now,
-            last_observed=now,
-            notes=notes
+            notes=notes,
+            now=datetime.now()
         )
+        if validate:
+            data = BehavioralPattern.model_validate(data).model_dump(mode='json')
 
         await self.backends.save_long_term_memory(
             child_id=child_id,
             memory_type="behavioral_patterns",
             key=pattern_id,
-            data=pattern.model_dump(mode='json')
+            data=data
         )
 
         return pattern_id
 
+    @staticmethod
+    def _make_pattern_dict(
+        behavior: str,
+        context: str,
+        frequency: str,
+        triggers: List[str],
+        severity: str,
+        notes: Optional[str],
+        now: datetime
+    ) -> Dict[str, Any]:
+        """
+        Build a JSON-ready behavioral pattern without a model round trip.
+
+        Produces the same document as BehavioralPattern.model_dump(mode='json').
+
+        Args:
+            behavior: Description of the behavior
+            context: Context in which behavior occurs
+            frequency: How often it occurs
+            triggers: Known triggers
+            severity: Severity level
+            notes: Additional notes
+            now: Observation time used for first/last observed
+
+        Returns:
+            Pattern data for the store
+        """
+        observed = now.isoformat()
+        return {
+            "behavior": behavior,
+            "context": context,
+            "frequency": frequency,
+            "triggers": list(triggers),
+            "first_observed": observed,
+            "last_observed": observed,
+            "severity": severity,
+            "notes": notes
+        }
+
     async def update_behavioral_pattern(
         self,
         child_id: int,
@@ -156,7 +215,7 @@ class MemoryManager:
         Returns:
             Milestone ID
         """
-        milestone_id = str(uuid.uuid4())
+        milestone_id = _new_memory_key()
 
         milestone_obj = DevelopmentalMilestone(
             milestone=milestone,
@@ -198,7 +257,7 @@ class MemoryManager:
         Returns:
             Intervention ID
         """
-        intervention_id = str(uuid.uuid4())
+        intervention_id = _new_memory_key()
 
         intervention = SuccessfulIntervention(
             strategy=strategy,
@@ -239,7 +298,7 @@ class MemoryManager:
         Returns:
             Trigger-response ID
         """
-        tr_id = str(uuid.uuid4())
+        tr_id = _new_memory_key()
 
         trigger_response = TriggerResponse(
             trigger=trigger,
@@ -279,7 +338,7 @@ class MemoryManager:
         Returns:
             Event ID
         """
-        event_id = str(uuid.uuid4())
+        event_id = _new_memory_key()
 
         timeline_event = TimelineEvent(
             event=event,
@@ -361,71 +420,48 @@ class MemoryManager:
         Returns:
             Temporal analysis including frequency trends
         """
-        # Search for relevant patterns
-        patterns = await self.backends.search_memories(
-            child_id=child_id,
-            query=behavior_query,
-            memory_types=["behavioral_patterns"],
-            limit=50
-        )
-
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-
-        # Analyze temporal trends
-        recent_patterns = []
-        frequency_counts = defaultdict(int)
-
-        for pattern_data in patterns:
-            pattern = pattern_data["data"]
-            last_observed = datetime.fromisoformat(pattern.get("last_observed", ""))
-
-            if last_observed >= cutoff_date:
-                recent_patterns.append(pattern_data)
-                frequency = pattern.get("frequency", "unknown")
-                frequency_counts[frequency] += 1
-
-        # Calculate trend
-        time_sorted = sorted(
-            recent_patterns,
-            key=lambda x: x["data"].get("last_observed", ""),
-            reverse=True
+        now = datetime.now()
+        cutoff_date = now - timedelta(days=days_back)
+        mid_cutoff = now - timedelta(days=days_back // 2)
+
+        total, recent_count, recent_half, frequency_counts, recent_occurrences = (
+            await self.backends.aggregate_patterns(
+                child_id=child_id,
+                query=behavior_query,
+                since=cutoff_date,
+                limit_recent=10,
+                midpoint=mid_cutoff
+            )
         )
 
         return {
-            "total_relevant_patterns": len(patterns),
-            "recent_patterns": len(recent_patterns),
+            "total_relevant_patterns": total,
+            "recent_patterns": recent_count,
             "days_analyzed": days_back,
-            "frequency_distribution": dict(frequency_counts),
-            "recent_occurrences": time_sorted[:10],
-            "trend": self._calculate_trend(time_sorted, days_back)
+            "frequency_distribution": frequency_counts,
+            "recent_occurrences": recent_occurrences,
+            "trend": self._calculate_trend(recent_count, recent_half)
         }
 
     def _calculate_trend(
         self,
-        time_sorted_patterns: List[Dict],
-        days_back: int
+        recent_count: int,
+        recent_half: int
     ) -> str:
         """
-        Calculate trend direction from temporal data.
+        Calculate trend direction from temporal counts.
 
         Args:
-            time_sorted_patterns: Patterns sorted by time
-            days_back: Analysis period
+            recent_count: Patterns observed within the analysis period
+            recent_half: Patterns observed within the newer half of the period
 
         Returns:
             Trend description
         """
-        if len(time_sorted_patterns) < 2:
+        if recent_count < 2:
             return "insufficient_data"
 
-        mid_point = days_back // 2
-        cutoff = datetime.now() - timedelta(days=mid_point)
-
-        recent_half = sum(
-            1 for p in time_sorted_patterns
-            if datetime.fromisoformat(p["data"].get("last_observed", "")) >= cutoff
-        )
-        older_half = len(time_sorted_patterns) - recent_half
+        older_half = recent_count - recent_half
 
         if recent_half > older_half * 1.5:
             return "increasing"
@@ -457,8 +493,13 @@ class MemoryManager:
             "timeline_events"
         ]
 
-        for memory_type in memory_types:
-            items = await self.backends.list_memories(child_id, memory_type, limit=100)
+        # Namespaces are independent, so list them concurrently
+        per_type_items = await asyncio.gather(*(
+            self.backends.list_memories(child_id, memory_type, limit=100)
+            for memory_type in memory_types
+        ))
+
+        for memory_type, items in zip(memory_types, per_type_items):
             summary[memory_type] = {
                 "count": len(items),
                 "recent": items[:5] if items else []
@@ -495,16 +536,18 @@ class MemoryManager:
             limit=20
         )
 
-        # Calculate recurrence metrics
-        first_obs = datetime.fromisoformat(pattern.get("first_observed", ""))
-        last_obs = datetime.fromisoformat(pattern.get("last_observed", ""))
-        duration_days = (last_obs - first_obs).days
+        # Calculate recurrence metrics; the stored ISO strings are returned as-is
+        first_observed = pattern.get("first_observed", "")
+        last_observed = pattern.get("last_observed", "")
+        duration_days = (
+            datetime.fromisoformat(last_observed) - datetime.fromisoformat(first_observed)
+        ).days
 
         return {
             "pattern_id": pattern_id,
             "behavior": pattern.get("behavior"),
-            "first_observed": first_obs.isoformat(),
-            "last_observed": last_obs.isoformat(),
+            "first_observed": first_observed,
+            "last_observed": last_observed,
             "duration_days": duration_days,
             "frequency": pattern.get("frequency"),
             "severity": pattern.get("severity"),
@@ -104,17 +104,18 @@ def add_behavioral_pattern(
     severity: str = "mild"
 ) -> ChildMemory:
     """Add a new behavioral pattern to memory."""
+    now = datetime.now()
     pattern = BehavioralPattern(
         behavior=behavior,
         context=context,
         frequency=frequency,
         triggers=triggers,
         severity=severity,
-        first_observed=datetime.now(),
-        last_observed=datetime.now()
+        first_observed=now,
+        last_observed=now
     )
     memory.behavioral_patterns.append(pattern)
-    memory.last_updated = datetime.now()
+    memory.last_updated = now
     return memory
 
 
@@ -127,16 +128,17 @@ def add_successful_intervention(
     contexts: List[str]
 ) -> ChildMemory:
     """Add a successful intervention to memory."""
+    now = datetime.now()
     intervention = SuccessfulIntervention(
         strategy=strategy,
         issue_addressed=issue_addressed,
         effectiveness=effectiveness,
-        applied_date=datetime.now(),
+        applied_date=now,
         outcome=outcome,
         applicable_contexts=contexts
     )
     memory.successful_interventions.append(intervention)
-    memory.last_updated = datetime.now()
+    memory.last_updated = now
     return memory
 
 
@@ -148,13 +150,14 @@ def add_timeline_event(
     behavioral_changes: List[str] = None
 ) -> ChildMemory:
     """Add a timeline event to memory."""
+    now = datetime.now()
     timeline_event = TimelineEvent(
         event=event,
-        date=datetime.now(),
+        date=now,
         category=category,
         impact=impact,
         behavioral_changes=behavioral_changes or []
     )
     memory.timeline_events.append(timeline_event)
-    memory.last_updated = datetime.now()
+    memory.last_updated = now
     return memory
@@ -1,9 +1,10 @@
 """Child profile database model."""
-from datetime import date
+from datetime import date, datetime
+from functools import cached_property
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import String, Date, Integer, Text, ForeignKey
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Date, Integer, Text, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.database.base import Base
 
@@ -27,12 +28,14 @@ class Child(Base):
     """
 
     __tablename__ = "children"
+    __table_args__ = (
+        Index("ix_child_parent_dob", "parent_id", "date_of_birth"),
+    )
 
     parent_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     date_of_birth: Mapped[date] = mapped_column(Date, nullable=False)
@@ -47,10 +50,15 @@ class Child(Base):
         cascade="all, delete-orphan"
     )
 
-    @property
+    @validates("date_of_birth")
+    def _validate_date_of_birth(self, key: str, value: date) -> date:
+        """Drop the memoized age whenever the date of birth changes."""
+        self.__dict__.pop("age_years", None)
+        return value
+
+    @cached_property
     def age_years(self) -> int:
-        """Calculate child's current age in years."""
-        from datetime import datetime
+        """Calculate child's current age in years (memoized per instance)."""
         today = datetime.now().date()
         age = today.year - self.date_of_birth.year
         if today.month < self.date_of_birth.month or \
@@ -1,14 +1,14 @@
 """Conversation database model."""
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import String, Integer, Text, ForeignKey, Boolean
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, Text, ForeignKey, Boolean, Index, false, func, select
+from sqlalchemy.orm import Mapped, mapped_column, relationship, column_property
 
 from app.database.base import Base
+from app.models.message import Message
 
 if TYPE_CHECKING:
     from app.models.child import Child
-    from app.models.message import Message
 
 
 class Conversation(Base):
@@ -21,23 +21,29 @@ class Conversation(Base):
         title: Conversation title (auto-generated from first message)
         summary: Brief summary of conversation topic
         is_active: Whether conversation is active or archived
+        first_exchange_done: Whether the first user/assistant exchange has completed
+        message_count: Number of messages (deferred; undefer when listing)
+        last_message_at: Time of the newest message, or created_at if empty (deferred)
         child: Relationship to Child
         messages: Relationship to Messages
     """
 
     __tablename__ = "conversations"
+    __table_args__ = (
+        # Composite indexes also cover plain lookups on their leading FK column
+        Index("ix_conv_user_active", "user_id", "is_active"),
+        Index("ix_conv_child_active_created", "child_id", "is_active", "created_at"),
+    )
 
     child_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("children.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     user_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("users.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
     thread_id: Mapped[str] = mapped_column(
         String(255),
@@ -48,9 +54,16 @@ class Conversation(Base):
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    first_exchange_done: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        server_default=false(),
+        nullable=False
+    )
 
     # Relationships
-    child: Mapped["Child"] = relationship("Child", back_populates="conversations")
+    # Load explicitly (joined/contains_eager); implicit lazy loads don't work under asyncio
+    child: Mapped["Child"] = relationship("Child", back_populates="conversations", lazy="raise")
     messages: Mapped[List["Message"]] = relationship(
         "Message",
         back_populates="conversation",
@@ -61,3 +74,29 @@ class Conversation(Base):
     def __repr__(self) -> str:
         """String representation."""
         return f"<Conversation(id={self.id}, thread_id={self.thread_id}, title={self.title[:50]})>"
+
+
+# Correlated COUNT subquery; deferred so it is only computed when requested
+Conversation.message_count = column_property(
+    select(func.count(Message.id))
+    .where(Message.conversation_id == Conversation.id)
+    .correlate_except(Message)
+    .scalar_subquery(),
+    deferred=True
+)
+
+
+# Newest message time, derived on read so sending a message never has to
+# UPDATE the conversation row; ordering by id walks ix_messages_conv_id
+Conversation.last_message_at = column_property(
+    func.coalesce(
+        select(Message.created_at)
+        .where(Message.conversation_id == Conversation.id)
+        .correlate_except(Message)
+        .order_by(Message.id.desc())
+        .limit(1)
+        .scalar_subquery(),
+        Conversation.created_at
+    ),
+    deferred=True
+)
@@ -1,7 +1,8 @@
 """Message database model."""
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from sqlalchemy import String, Integer, Text, ForeignKey
+from sqlalchemy import Enum as SQLEnum, Integer, Text, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -31,19 +32,31 @@ class Message(Base):
     """
 
     __tablename__ = "messages"
+    __table_args__ = (
+        # History reads filter by conversation and order by id; this serves
+        # both without a sort and also covers plain conversation_id lookups
+        Index("ix_messages_conv_id", "conversation_id", "id"),
+    )
 
     conversation_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("conversations.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True
+        nullable=False
     )
+    # Native enum: 4 bytes per row and only MessageRole values accepted
     role: Mapped[str] = mapped_column(
-        String(50),
+        SQLEnum(*(r.value for r in MessageRole), name="message_role"),
         nullable=False
     )
-    content: Mapped[str] = mapped_column(Text, nullable=False)
-    extra_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # JSON string
+    # Deferred: ORM loads skip bodies unless they undefer_group("body");
+    # history views select the column directly
+    content: Mapped[str] = mapped_column(
+        Text,
+        nullable=False,
+        deferred=True,
+        deferred_group="body"
+    )
+    extra_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
 
     # Relationships
     conversation: Mapped["Conversation"] = relationship(
@@ -53,5 +66,13 @@ class Message(Base):
 
     def __repr__(self) -> str:
         """String representation."""
-        content_preview = self.content[:50] + "..." if len(self.content) > 50 else self.content
+        # Read the loaded value directly: content is deferred, and touching
+        # the attribute here would emit a lazy load from inside repr()
+        content = self.__dict__.get("content")
+        if content is None:
+            content_preview = "<not loaded>"
+        elif len(content) > 50:
+            content_preview = content[:50] + "..."
+        else:
+            content_preview = content
         return f"<Message(id={self.id}, role={self.role}, content='{content_preview}')>"
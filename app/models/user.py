@@ -1,7 +1,8 @@
 """User (Parent) database model."""
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import String, Boolean
+from sqlalchemy import String, Boolean, Index, text
+from sqlalchemy.dialects.postgresql import CITEXT
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
@@ -15,7 +16,7 @@ class User(Base):
     User model representing a parent account.
 
     Attributes:
-        email: Unique email address for authentication
+        email: Unique, case-insensitive email address for authentication
         hashed_password: Bcrypt hashed password (nullable for Firebase users)
         full_name: Parent's full name
         is_active: Whether the account is active
@@ -25,9 +26,19 @@ class User(Base):
     """
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Most users sign in with a password, so keep NULL uids out of the index
+        Index(
+            "ix_users_firebase_uid",
+            "firebase_uid",
+            unique=True,
+            postgresql_where=text("firebase_uid IS NOT NULL")
+        ),
+    )
 
+    # CITEXT: case-insensitive equality served directly by the unique index
     email: Mapped[str] = mapped_column(
-        String(255),
+        CITEXT(),
         unique=True,
         index=True,
         nullable=False
@@ -36,18 +47,16 @@ class User(Base):
     full_name: Mapped[str] = mapped_column(String(255), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
-    firebase_uid: Mapped[Optional[str]] = mapped_column(
-        String(128),
-        unique=True,
-        index=True,
-        nullable=True
-    )
+    firebase_uid: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
 
     # Relationships
+    # selectin: loading a user fetches all of their children in one extra
+    # IN query; authentication lookups opt out with lazyload(User.children)
     children: Mapped[List["Child"]] = relationship(
         "Child",
         back_populates="parent",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="selectin"
     )
 
     def __repr__(self) -> str:
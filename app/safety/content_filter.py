@@ -1,14 +1,38 @@
 """Content filtering and safety checks for responses."""
+import asyncio
+import sys
 from typing import Dict, Any, Optional
 from langgraph.types import interrupt
 
-from app.safety.triggers import detect_sensitive_content, should_interrupt_for_review
+from app.safety.triggers import (
+    detect_sensitive_content_async,
+    mask_to_flags,
+    should_interrupt_for_review
+)
 from app.safety.disclaimers import (
     format_response_with_disclaimers,
     get_human_review_prompt
 )
 
 
+# Sent in place of a response rejected during human review
+_REJECTION_BASE = sys.intern("""
+Thank you for your question. Based on the nature of your concern, I strongly recommend consulting with a qualified professional who can provide personalized guidance for your child's specific situation.
+
+**Professional resources that may help:**
+- **Pediatrician**: For medical or developmental concerns
+- **Child Psychologist**: For behavioral or emotional concerns
+- **Licensed Therapist**: For ongoing support and intervention strategies
+
+If this is an emergency situation, please contact:
+- **911** for immediate emergencies
+- **988** for mental health crisis support
+- Your local crisis hotline
+
+I'm here to support you with general parenting guidance, but your child's wellbeing may benefit from professional clinical assessment.
+""".strip())
+
+
 class ContentSafetyFilter:
     """
     Content safety filter for AI responses.
@@ -49,17 +73,36 @@ class ContentSafetyFilter:
             - requires_review: Boolean
             - was_interrupted: Boolean indicating if HITL was triggered
             - human_decision: Decision from human review (if interrupted)
+            - detection_details: Raw detector output (only when review is required)
         """
+        # Nothing would be added and nobody would be asked: skip detection
+        if not self.auto_add_disclaimers and not enable_hitl:
+            return {
+                "filtered_content": content,
+                "safety_flags": [],
+                "requires_review": False,
+                "was_interrupted": False,
+                "human_decision": None,
+                "detection_details": None
+            }
+
         # Detect sensitive content in both user message and AI response
-        user_detection = detect_sensitive_content(user_message) if user_message else None
-        response_detection = detect_sensitive_content(content)
+        # Scans run in worker threads so long responses don't stall the event loop
+        if user_message:
+            user_detection, response_detection = await asyncio.gather(
+                detect_sensitive_content_async(user_message),
+                detect_sensitive_content_async(content)
+            )
+        else:
+            user_detection = None
+            response_detection = await detect_sensitive_content_async(content)
 
-        # Combine flags from both
-        all_flags = []
+        # Combine flags from both as a SafetyFlag bitmask
+        flag_mask = response_detection["flag_mask"]
         if user_detection:
-            all_flags.extend(user_detection.get("flags", []))
-        all_flags.extend(response_detection.get("flags", []))
-        all_flags = list(set(all_flags))  # Remove duplicates
+            flag_mask |= user_detection["flag_mask"]
+        # Stable ordering for API output and the review prompt
+        safety_flags = mask_to_flags(flag_mask)
 
         # Determine if review is needed
         requires_review = response_detection["requires_review"]
@@ -78,7 +121,7 @@ class ContentSafetyFilter:
             if self.auto_add_disclaimers:
                 filtered_content = format_response_with_disclaimers(
                     content,
-                    all_flags,
+                    flag_mask,
                     prepend=False  # Add disclaimers after content
                 )
 
@@ -87,7 +130,7 @@ class ContentSafetyFilter:
                 filtered_content,
                 {
                     "sensitivity_level": response_detection["sensitivity_level"],
-                    "flags": all_flags,
+                    "flags": safety_flags,
                     "matched_terms": response_detection["matched_terms"],
                     "recommendation": response_detection["recommendation"]
                 }
@@ -106,24 +149,25 @@ class ContentSafetyFilter:
                 human_decision
             )
 
-        elif self.auto_add_disclaimers and all_flags:
+        elif self.auto_add_disclaimers and flag_mask:
             # Add disclaimers without interrupting
             filtered_content = format_response_with_disclaimers(
                 content,
-                all_flags,
+                flag_mask,
                 prepend=False
             )
 
         return {
             "filtered_content": filtered_content,
-            "safety_flags": all_flags,
+            "safety_flags": safety_flags,
             "requires_review": requires_review,
             "was_interrupted": was_interrupted,
             "human_decision": human_decision,
+            # Raw detector output is only of interest when a review is needed
             "detection_details": {
                 "user_detection": user_detection,
                 "response_detection": response_detection
-            }
+            } if requires_review else None
         }
 
     def _process_human_decision(
@@ -170,21 +214,7 @@ class ContentSafetyFilter:
         Returns:
             Safe response message
         """
-        base_message = """
-Thank you for your question. Based on the nature of your concern, I strongly recommend consulting with a qualified professional who can provide personalized guidance for your child's specific situation.
-
-**Professional resources that may help:**
-- **Pediatrician**: For medical or developmental concerns
-- **Child Psychologist**: For behavioral or emotional concerns
-- **Licensed Therapist**: For ongoing support and intervention strategies
-
-If this is an emergency situation, please contact:
-- **911** for immediate emergencies
-- **988** for mental health crisis support
-- Your local crisis hotline
-
-I'm here to support you with general parenting guidance, but your child's wellbeing may benefit from professional clinical assessment.
-""".strip()
+        base_message = _REJECTION_BASE
 
         if reason:
             base_message = f"{base_message}\n\n**Review Note:** {reason}"
@@ -1,6 +1,9 @@
 """Disclaimer templates for safety compliance."""
+import sys
 from enum import Enum
-from typing import Dict
+from typing import Dict, Iterable, Tuple, Union
+
+from app.safety.triggers import FLAG_MASK_COUNT, SafetyFlag, flags_to_mask
 
 
 class DisclaimerType(Enum):
@@ -77,6 +80,9 @@ These professionals can provide:
 """.strip(),
 }
 
+# One shared object per disclaimer, so selection can dedupe by identity
+DISCLAIMERS = {key: sys.intern(text) for key, text in DISCLAIMERS.items()}
+
 
 def get_disclaimer(disclaimer_type: DisclaimerType) -> str:
     """
@@ -91,15 +97,40 @@ def get_disclaimer(disclaimer_type: DisclaimerType) -> str:
     return DISCLAIMERS.get(disclaimer_type, DISCLAIMERS[DisclaimerType.GENERAL])
 
 
-def get_disclaimers_for_flags(flags: list[str]) -> list[str]:
+_DISCLAIMER_SEPARATOR = "\n\n---\n\n"
+
+_REVIEW_PROMPT_TEMPLATE = """
+# Human Review Required
+
+**Sensitivity Level:** {level}
+**Detected Issues:** {flags}
+**Matched Terms:** {matched}
+**Recommendation:** {rec}
+
+## AI-Generated Response:
+{body}
+
+## Review Actions:
+1. **Approve**: Send response as-is (with disclaimers)
+2. **Edit**: Modify response before sending
+3. **Reject**: Do not send, escalate to professional
+
+## Additional Disclaimers:
+{disclaimers}
+
+Please review and decide:
+""".strip()
+
+
+def _build_disclaimers(mask: int) -> Tuple[str, ...]:
     """
-    Get appropriate disclaimers based on detected safety flags.
+    Build the disclaimer list for a flag mask.
 
     Args:
-        flags: List of safety flags from trigger detection
+        mask: Bitmask of SafetyFlag values
 
     Returns:
-        List of disclaimer texts to include
+        Disclaimer texts to include
     """
     disclaimers = []
 
@@ -107,30 +138,69 @@ def get_disclaimers_for_flags(flags: list[str]) -> list[str]:
     disclaimers.append(get_disclaimer(DisclaimerType.GENERAL))
 
     # Add specific disclaimers based on flags
-    if "emergency" in flags:
+    if mask & SafetyFlag.EMERGENCY:
         disclaimers.append(get_disclaimer(DisclaimerType.EMERGENCY))
 
-    if "harm" in flags:
+    if mask & SafetyFlag.HARM:
         disclaimers.append(get_disclaimer(DisclaimerType.EMERGENCY))
         disclaimers.append(get_disclaimer(DisclaimerType.PROFESSIONAL_REFERRAL))
 
-    if "medical_advice" in flags or "medical" in flags:
+    if mask & (SafetyFlag.MEDICAL_ADVICE | SafetyFlag.MEDICAL):
         disclaimers.append(get_disclaimer(DisclaimerType.MEDICAL))
 
-    if "developmental_concern" in flags:
+    if mask & SafetyFlag.DEVELOPMENTAL_CONCERN:
         disclaimers.append(get_disclaimer(DisclaimerType.DEVELOPMENTAL))
 
     # Add professional referral for high-severity cases
-    if any(flag in flags for flag in ["medical_advice", "harm"]):
-        if get_disclaimer(DisclaimerType.PROFESSIONAL_REFERRAL) not in disclaimers:
-            disclaimers.append(get_disclaimer(DisclaimerType.PROFESSIONAL_REFERRAL))
+    if mask & (SafetyFlag.MEDICAL_ADVICE | SafetyFlag.HARM):
+        referral = get_disclaimer(DisclaimerType.PROFESSIONAL_REFERRAL)
+        if not any(text is referral for text in disclaimers):
+            disclaimers.append(referral)
+
+    return tuple(disclaimers)
+
+
+# Every flag combination is resolved once at import; lookups index by mask
+_DISCLAIMERS_FOR_MASK: Tuple[Tuple[str, ...], ...] = tuple(
+    _build_disclaimers(mask) for mask in range(FLAG_MASK_COUNT)
+)
+_JOINED_FOR_MASK: Tuple[str, ...] = tuple(
+    _DISCLAIMER_SEPARATOR.join(disclaimers) for disclaimers in _DISCLAIMERS_FOR_MASK
+)
+# Blocks with the content separator already attached, so formatting a
+# response is a single concatenation
+_SUFFIX_FOR_MASK: Tuple[str, ...] = tuple(
+    _DISCLAIMER_SEPARATOR + joined for joined in _JOINED_FOR_MASK
+)
+_PREFIX_FOR_MASK: Tuple[str, ...] = tuple(
+    joined + _DISCLAIMER_SEPARATOR for joined in _JOINED_FOR_MASK
+)
+_REVIEW_JOINED_FOR_MASK: Tuple[str, ...] = tuple(
+    "\n".join(disclaimers) for disclaimers in _DISCLAIMERS_FOR_MASK
+)
+
+
+def _as_mask(flags: Union[Iterable[str], int]) -> int:
+    """Accept either flag names or a precomputed SafetyFlag mask."""
+    return flags if isinstance(flags, int) else flags_to_mask(flags)
+
+
+def get_disclaimers_for_flags(flags: Union[Iterable[str], int]) -> Tuple[str, ...]:
+    """
+    Get appropriate disclaimers based on detected safety flags.
 
-    return disclaimers
+    Args:
+        flags: Safety flag names or a SafetyFlag mask
+
+    Returns:
+        Disclaimer texts to include
+    """
+    return _DISCLAIMERS_FOR_MASK[_as_mask(flags)]
 
 
 def format_response_with_disclaimers(
     content: str,
-    flags: list[str],
+    flags: Union[Iterable[str], int],
     prepend: bool = False
 ) -> str:
     """
@@ -138,7 +208,7 @@ def format_response_with_disclaimers(
 
     Args:
         content: Original response content
-        flags: Safety flags from detection
+        flags: Safety flag names or a SafetyFlag mask
         prepend: If True, add disclaimers before content; else after
 
     Returns:
@@ -147,13 +217,12 @@ def format_response_with_disclaimers(
     if not flags:
         return content
 
-    disclaimers = get_disclaimers_for_flags(flags)
-    disclaimer_text = "\n\n---\n\n".join(disclaimers)
+    mask = _as_mask(flags)
 
     if prepend:
-        return f"{disclaimer_text}\n\n---\n\n{content}"
+        return _PREFIX_FOR_MASK[mask] + content
     else:
-        return f"{content}\n\n---\n\n{disclaimer_text}"
+        return content + _SUFFIX_FOR_MASK[mask]
 
 
 def get_human_review_prompt(
@@ -170,30 +239,13 @@ def get_human_review_prompt(
     Returns:
         Formatted review prompt
     """
-    level = detection_result["sensitivity_level"]
     flags = detection_result["flags"]
-    matched_terms = detection_result["matched_terms"]
-    recommendation = detection_result["recommendation"]
-
-    prompt = f"""
-# Human Review Required
 
-**Sensitivity Level:** {level.upper()}
-**Detected Issues:** {', '.join(flags)}
-**Matched Terms:** {', '.join(matched_terms)}
-**Recommendation:** {recommendation}
-
-## AI-Generated Response:
-{response_content}
-
-## Review Actions:
-1. **Approve**: Send response as-is (with disclaimers)
-2. **Edit**: Modify response before sending
-3. **Reject**: Do not send, escalate to professional
-
-## Additional Disclaimers:
-{chr(10).join(get_disclaimers_for_flags(flags))}
-
-Please review and decide:
-"""
-    return prompt.strip()
+    return _REVIEW_PROMPT_TEMPLATE.format_map({
+        "level": detection_result["sensitivity_level"].upper(),
+        "flags": ", ".join(flags),
+        "matched": ", ".join(detection_result["matched_terms"]),
+        "rec": detection_result["recommendation"],
+        "body": response_content,
+        "disclaimers": _REVIEW_JOINED_FOR_MASK[_as_mask(flags)],
+    })
@@ -1,7 +1,11 @@
 """Sensitive topic detection for child behavioral therapist system."""
+import asyncio
 import re
-from typing import List, Dict, Any, Tuple
-from enum import Enum
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Optional, Set, Tuple
+from enum import Enum, IntFlag
+
+import ahocorasick
 
 
 class SensitivityLevel(Enum):
@@ -12,6 +16,208 @@ class SensitivityLevel(Enum):
     CRITICAL = "critical"
 
 
+class SafetyFlag(IntFlag):
+    """Bit values for detection flags, so flag sets can travel as one int."""
+    EMERGENCY = 1
+    HARM = 2
+    MEDICAL_ADVICE = 4
+    MEDICAL = 8
+    DEVELOPMENTAL_CONCERN = 16
+
+
+# Public flag names as they appear in detection results
+FLAG_BITS: Dict[str, SafetyFlag] = {
+    "emergency": SafetyFlag.EMERGENCY,
+    "harm": SafetyFlag.HARM,
+    "medical_advice": SafetyFlag.MEDICAL_ADVICE,
+    "medical": SafetyFlag.MEDICAL,
+    "developmental_concern": SafetyFlag.DEVELOPMENTAL_CONCERN,
+}
+
+# Number of distinct flag masks (all combinations of the flags above)
+FLAG_MASK_COUNT = 1 << len(FLAG_BITS)
+
+# Sorted flag names for every mask, built once
+_FLAG_NAMES_FOR_MASK: Tuple[Tuple[str, ...], ...] = tuple(
+    tuple(sorted(name for name, bit in FLAG_BITS.items() if mask & bit))
+    for mask in range(FLAG_MASK_COUNT)
+)
+
+
+# Masks checked by severity assessment
+_CRITICAL_MASK = int(SafetyFlag.EMERGENCY | SafetyFlag.HARM)
+_MEDICAL_DEVELOPMENTAL_MASK = int(SafetyFlag.MEDICAL | SafetyFlag.DEVELOPMENTAL_CONCERN)
+
+
+def flags_to_mask(flags: Iterable[str]) -> int:
+    """
+    Convert flag names to a bitmask, ignoring unknown names.
+
+    Args:
+        flags: Flag names
+
+    Returns:
+        Bitmask of SafetyFlag values
+    """
+    mask = 0
+    for flag in flags:
+        mask |= FLAG_BITS.get(flag, 0)
+    # Plain int keeps detection results JSON-friendly
+    return int(mask)
+
+
+def mask_to_flags(mask: int) -> List[str]:
+    """
+    Convert a bitmask back to sorted flag names.
+
+    Args:
+        mask: Bitmask of SafetyFlag values
+
+    Returns:
+        Sorted flag names
+    """
+    return list(_FLAG_NAMES_FOR_MASK[mask])
+
+
+def _expand_keyword_pattern(pattern: str) -> List[str]:
+    """
+    Expand a keyword regex into the literal phrases it matches.
+
+    Only the small regex subset used by the keyword tables is supported:
+    literals, groups with alternation, optional groups/characters and
+    character classes of literals, wrapped in word boundaries.
+
+    Args:
+        pattern: Keyword regex such as r"\\b(?:kill (?:myself|himself))\\b"
+
+    Returns:
+        Literal phrases matched by the pattern
+
+    Raises:
+        ValueError: If the pattern uses syntax that cannot be expanded
+    """
+    body = pattern
+    if body.startswith(r"\b") and body.endswith(r"\b"):
+        body = body[2:-2]
+    literals, pos = _expand_alternation(pattern, body, 0)
+    if pos != len(body):
+        raise ValueError(f"Unbalanced keyword pattern: {pattern!r}")
+    return literals
+
+
+def _expand_alternation(pattern: str, body: str, pos: int) -> Tuple[List[str], int]:
+    """Expand `a|b|...` starting at pos, stopping at `)` or end of body."""
+    options = []
+    while True:
+        sequence, pos = _expand_sequence(pattern, body, pos)
+        options.extend(sequence)
+        if pos < len(body) and body[pos] == "|":
+            pos += 1
+            continue
+        return options, pos
+
+
+def _expand_sequence(pattern: str, body: str, pos: int) -> Tuple[List[str], int]:
+    """Expand a run of literals, groups and classes starting at pos."""
+    results = [""]
+    while pos < len(body) and body[pos] not in "|)":
+        char = body[pos]
+        if char == "(":
+            start = pos + 3 if body.startswith("(?:", pos) else pos + 1
+            choices, pos = _expand_alternation(pattern, body, start)
+            if pos >= len(body):
+                raise ValueError(f"Unbalanced keyword pattern: {pattern!r}")
+            pos += 1
+        elif char == "[":
+            end = body.find("]", pos)
+            if end == -1:
+                raise ValueError(f"Unbalanced keyword pattern: {pattern!r}")
+            members = body[pos + 1:end]
+            # Ranges like [a-z] are not literal sets
+            if "-" in members[1:-1]:
+                raise ValueError(f"Unsupported syntax in keyword pattern: {pattern!r}")
+            choices = list(members)
+            pos = end + 1
+        elif char in ".*+?{}^$\\":
+            raise ValueError(f"Unsupported syntax in keyword pattern: {pattern!r}")
+        else:
+            choices = [char]
+            pos += 1
+
+        # Optional group or character
+        if pos < len(body) and body[pos] == "?":
+            choices = choices + [""]
+            pos += 1
+
+        results = [prefix + choice for prefix in results for choice in choices]
+    return results, pos
+
+
+# Non-ASCII letters that re.IGNORECASE matched against ASCII keyword letters
+# but str.lower() does not turn into them ("İ".lower() is "i" plus a dot)
+_ASCII_FOLD = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s"})
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase text the way the original IGNORECASE keyword regexes compared it."""
+    return text.translate(_ASCII_FOLD).lower()
+
+
+def _is_word_char(char: str) -> bool:
+    """Match the regex definition of a \\w character."""
+    return char.isalnum() or char == "_"
+
+
+def _build_scanner(
+    categories: Iterable[Tuple[str, Iterable[str]]]
+) -> Tuple[Any, Optional[re.Pattern]]:
+    """
+    Build one Aho-Corasick automaton over every keyword literal.
+
+    Keyword regexes are expanded into their literal phrases so a single
+    pass over the text finds all categories at once. A phrase listed
+    under several categories carries all of their flag bits. Patterns
+    that cannot be expanded stay as regexes, fused into one alternation
+    with a named group per category.
+
+    Args:
+        categories: (flag name, keyword patterns) pairs
+
+    Returns:
+        Tuple of (automaton, fused regex for non-literal patterns or None)
+    """
+    literal_masks: Dict[str, int] = {}
+    residual: Dict[str, List[str]] = {}
+    for category, patterns in categories:
+        flag = int(FLAG_BITS[category])
+        for pattern in patterns:
+            try:
+                literals = _expand_keyword_pattern(pattern)
+            except ValueError:
+                residual.setdefault(category, []).append(pattern)
+                continue
+            for literal in literals:
+                literal = literal.lower()
+                literal_masks[literal] = literal_masks.get(literal, 0) | flag
+
+    # lastgroup names the category of each regex-only match. Keywords are
+    # lowercase and matched against lowercased text, so no IGNORECASE.
+    residual_pattern = None
+    if residual:
+        residual_pattern = re.compile(
+            "|".join(
+                f"(?P<{category}>{'|'.join(patterns)})"
+                for category, patterns in residual.items()
+            )
+        )
+
+    automaton = ahocorasick.Automaton()
+    for literal, mask in literal_masks.items():
+        automaton.add_word(literal, (literal, mask))
+    automaton.make_automaton()
+    return automaton, residual_pattern
+
+
 class SafetyTrigger:
     """
     Detects sensitive topics that require human review.
@@ -24,60 +230,48 @@ class SafetyTrigger:
     """
 
     # Medical and clinical keywords
-    MEDICAL_KEYWORDS = [
-        r"\b(adhd|add|autism|asd|asperger)\b",
-        r"\b(depression|anxiety|ptsd|ocd)\b",
-        r"\b(bipolar|schizophrenia|psychosis)\b",
-        r"\b(disorder|syndrome|diagnosis)\b",
-        r"\b(medication|prescri(be|ption)|pill|drug)\b",
-        r"\b(therapist|psychiatrist|psychologist|doctor)\b",
-    ]
+    MEDICAL_KEYWORDS = (
+        r"\b(?:adhd|add|autism|asd|asperger)\b",
+        r"\b(?:depression|anxiety|ptsd|ocd)\b",
+        r"\b(?:bipolar|schizophrenia|psychosis)\b",
+        r"\b(?:disorder|syndrome|diagnosis)\b",
+        r"\b(?:medication|prescri(?:be|ption)|pill|drug)\b",
+        r"\b(?:therapist|psychiatrist|psychologist|doctor)\b",
+    )
 
     # Harm and abuse keywords
-    HARM_KEYWORDS = [
-        r"\b(abuse|abusive|abused)\b",
-        r"\b(hit|hitting|beat|beating|hurt|hurting)\b",
-        r"\b(self[- ]harm|cutting|suicide|kill)\b",
-        r"\b(neglect|neglected|abandoned)\b",
-        r"\b(violence|violent|aggress(ion|ive))\b",
-        r"\b(trauma|traumatic|traumatized)\b",
-    ]
+    HARM_KEYWORDS = (
+        r"\b(?:abuse|abusive|abused)\b",
+        r"\b(?:hit|hitting|beat|beating|hurt|hurting)\b",
+        r"\b(?:self[- ]harm|cutting|suicide|kill)\b",
+        r"\b(?:neglect|neglected|abandoned)\b",
+        r"\b(?:violence|violent|aggress(?:ion|ive))\b",
+        r"\b(?:trauma|traumatic|traumatized)\b",
+    )
 
     # Emergency keywords
-    EMERGENCY_KEYWORDS = [
-        r"\b(emergency|urgent|immediate|crisis)\b",
-        r"\b(danger|dangerous|unsafe)\b",
-        r"\b(hospital|911|emergency room|er)\b",
-        r"\b(suicide|suicidal|kill (myself|himself|herself))\b",
-    ]
+    EMERGENCY_KEYWORDS = (
+        r"\b(?:emergency|urgent|immediate|crisis)\b",
+        r"\b(?:danger|dangerous|unsafe)\b",
+        r"\b(?:hospital|911|emergency room|er)\b",
+        r"\b(?:suicide|suicidal|kill (?:myself|himself|herself))\b",
+    )
 
     # Serious developmental concerns
-    DEVELOPMENTAL_KEYWORDS = [
-        r"\b(not (talking|speaking|walking))\b",
-        r"\b(severe(ly)? delay(ed)?)\b",
-        r"\b(regress(ion|ing|ed))\b",
-        r"\b(stop(ped)? (eating|drinking|sleeping))\b",
-    ]
+    DEVELOPMENTAL_KEYWORDS = (
+        r"\b(?:not (?:talking|speaking|walking))\b",
+        r"\b(?:severe(?:ly)? delay(?:ed)?)\b",
+        r"\b(?:regress(?:ion|ing|ed))\b",
+        r"\b(?:stop(?:ped)? (?:eating|drinking|sleeping))\b",
+    )
 
     # Medical advice keywords
-    MEDICAL_ADVICE_KEYWORDS = [
-        r"\b(should (i|we) (give|take|use))\b",
-        r"\b(how much|dosage|dose)\b",
-        r"\b(stop (taking|using)|start (taking|using))\b",
-        r"\b(safe to (give|take|use))\b",
-    ]
-
-    def __init__(self):
-        """Initialize safety trigger detector."""
-        self._compile_patterns()
-
-    def _compile_patterns(self):
-        """Compile regex patterns for efficiency."""
-        self.medical_patterns = [re.compile(p, re.IGNORECASE) for p in self.MEDICAL_KEYWORDS]
-        self.harm_patterns = [re.compile(p, re.IGNORECASE) for p in self.HARM_KEYWORDS]
-        self.emergency_patterns = [re.compile(p, re.IGNORECASE) for p in self.EMERGENCY_KEYWORDS]
-        self.developmental_patterns = [re.compile(p, re.IGNORECASE) for p in self.DEVELOPMENTAL_KEYWORDS]
-        self.medical_advice_patterns = [re.compile(p, re.IGNORECASE) for p in self.MEDICAL_ADVICE_KEYWORDS]
+    MEDICAL_ADVICE_KEYWORDS = (
+        r"\b(?:should (?:i|we) (?:give|take|use))\b",
+        r"\b(?:how much|dosage|dose)\b",
+        r"\b(?:stop (?:taking|using)|start (?:taking|using))\b",
+        r"\b(?:safe to (?:give|take|use))\b",
+    )
 
     def detect_sensitive_content(self, text: str) -> Dict[str, Any]:
         """
@@ -91,81 +285,69 @@ class SafetyTrigger:
             - sensitivity_level: SAFE, MODERATE, HIGH, CRITICAL
             - requires_review: Boolean
             - flags: List of triggered categories
+            - flag_mask: Triggered categories as a SafetyFlag bitmask
             - matched_terms: List of matched keywords
             - recommendation: Action recommendation
         """
-        flags = []
-        matched_terms = []
-
-        # Check emergency (highest priority)
-        emergency_matches = self._check_patterns(text, self.emergency_patterns)
-        if emergency_matches:
-            flags.append("emergency")
-            matched_terms.extend(emergency_matches)
-
-        # Check harm
-        harm_matches = self._check_patterns(text, self.harm_patterns)
-        if harm_matches:
-            flags.append("harm")
-            matched_terms.extend(harm_matches)
-
-        # Check medical advice
-        medical_advice_matches = self._check_patterns(text, self.medical_advice_patterns)
-        if medical_advice_matches:
-            flags.append("medical_advice")
-            matched_terms.extend(medical_advice_matches)
-
-        # Check medical/clinical
-        medical_matches = self._check_patterns(text, self.medical_patterns)
-        if medical_matches:
-            flags.append("medical")
-            matched_terms.extend(medical_matches)
-
-        # Check developmental concerns
-        developmental_matches = self._check_patterns(text, self.developmental_patterns)
-        if developmental_matches:
-            flags.append("developmental_concern")
-            matched_terms.extend(developmental_matches)
+        matched_terms: Set[str] = set()
+        text_lower = _normalize_text(text)
+        mask = self._scan_literals(text_lower, matched_terms)
+
+        if _RESIDUAL_PATTERN is not None:
+            for match in _RESIDUAL_PATTERN.finditer(text_lower):
+                mask |= int(FLAG_BITS[match.lastgroup])
+                matched_terms.add(match.group())
+
+        # Flags in priority order: emergency, harm, medical advice, medical, developmental
+        flags = [name for name, bit in FLAG_BITS.items() if mask & bit]
 
         # Determine sensitivity level and action
-        sensitivity_level, requires_review, recommendation = self._assess_severity(flags)
+        sensitivity_level, requires_review, recommendation = self._assess_severity(mask)
 
         return {
             "sensitivity_level": sensitivity_level.value,
             "requires_review": requires_review,
             "flags": flags,
-            "matched_terms": list(set(matched_terms)),  # Remove duplicates
+            "flag_mask": mask,
+            "matched_terms": list(matched_terms),
             "recommendation": recommendation
         }
 
-    def _check_patterns(self, text: str, patterns: List[re.Pattern]) -> List[str]:
+    def _scan_literals(self, text_lower: str, sink: Set[str]) -> int:
         """
-        Check text against list of regex patterns.
+        Find keyword literals in one pass over lowercased text.
 
         Args:
-            text: Text to check
-            patterns: Compiled regex patterns
+            text_lower: Lowercased text to check
+            sink: Set that matched terms are added to
 
         Returns:
-            List of matched terms
+            Flag bitmask of matched categories
         """
-        matches = []
-        for pattern in patterns:
-            found = pattern.findall(text)
-            matches.extend(found)
-        return matches
-
-    def _assess_severity(self, flags: List[str]) -> Tuple[SensitivityLevel, bool, str]:
+        mask = 0
+        last = len(text_lower) - 1
+        for end, (literal, bits) in _AUTOMATON.iter(text_lower):
+            start = end - len(literal) + 1
+            # Same word-boundary rule as the original \b...\b patterns
+            if start > 0 and _is_word_char(text_lower[start - 1]):
+                continue
+            if end < last and _is_word_char(text_lower[end + 1]):
+                continue
+            mask |= bits
+            sink.add(literal)
+        return mask
+
+    def _assess_severity(self, mask: int) -> Tuple[SensitivityLevel, bool, str]:
         """
         Assess severity based on triggered flags.
 
         Args:
-            flags: List of triggered flag categories
+            mask: SafetyFlag bitmask of triggered categories
 
         Returns:
             Tuple of (sensitivity_level, requires_review, recommendation)
         """
-        if not flags:
+        if not mask:
             return (
                 SensitivityLevel.SAFE,
                 False,
@@ -173,7 +355,7 @@ class SafetyTrigger:
             )
 
         # CRITICAL: Emergency or harm detected
-        if "emergency" in flags or "harm" in flags:
+        if mask & _CRITICAL_MASK:
             return (
                 SensitivityLevel.CRITICAL,
                 True,
@@ -181,8 +363,8 @@ class SafetyTrigger:
             )
 
         # HIGH: Medical advice or serious developmental concerns
-        if "medical_advice" in flags or (
-            "developmental_concern" in flags and "medical" in flags
+        if mask & SafetyFlag.MEDICAL_ADVICE or (
+            (mask & _MEDICAL_DEVELOPMENTAL_MASK) == _MEDICAL_DEVELOPMENTAL_MASK
         ):
             return (
                 SensitivityLevel.HIGH,
@@ -191,7 +373,7 @@ class SafetyTrigger:
             )
 
         # MODERATE: Medical mentions or developmental concerns
-        if "medical" in flags or "developmental_concern" in flags:
+        if mask & _MEDICAL_DEVELOPMENTAL_MASK:
             return (
                 SensitivityLevel.MODERATE,
                 True,
@@ -244,21 +426,85 @@ class SafetyTrigger:
         return message
 
 
+# Keyword scanner, built once at import and shared by every SafetyTrigger
+_AUTOMATON, _RESIDUAL_PATTERN = _build_scanner((
+    ("emergency", SafetyTrigger.EMERGENCY_KEYWORDS),
+    ("harm", SafetyTrigger.HARM_KEYWORDS),
+    ("medical_advice", SafetyTrigger.MEDICAL_ADVICE_KEYWORDS),
+    ("medical", SafetyTrigger.MEDICAL_KEYWORDS),
+    ("developmental_concern", SafetyTrigger.DEVELOPMENTAL_KEYWORDS),
+))
+
 # Singleton instance
 safety_trigger_detector = SafetyTrigger()
 
 
+# Detection cache bounds. Longer texts are scanned uncached so the cache
+# never pins large message bodies in memory.
+_DETECT_CACHE_SIZE = 4096
+_DETECT_CACHE_MAX_CHARS = 2048
+
+
+@lru_cache(maxsize=_DETECT_CACHE_SIZE)
+def _detect_normalized(text_norm: str) -> Tuple[str, bool, Tuple[str, ...], int, Tuple[str, ...], str]:
+    """
+    Cached detection on normalized text.
+
+    Results are stored as tuples so cached entries can't be mutated by callers.
+    """
+    result = safety_trigger_detector.detect_sensitive_content(text_norm)
+    return (
+        result["sensitivity_level"],
+        result["requires_review"],
+        tuple(result["flags"]),
+        result["flag_mask"],
+        tuple(result["matched_terms"]),
+        result["recommendation"],
+    )
+
+
 def detect_sensitive_content(text: str) -> Dict[str, Any]:
     """
     Convenience function to detect sensitive content.
 
+    Repeated texts (retries, duplicate sends) are served from an LRU cache
+    keyed on the lowercased text, the same normalization the detector
+    applies, so cached and uncached results are identical. Texts over
+    _DETECT_CACHE_MAX_CHARS are not cached.
+
+    Args:
+        text: Text to analyze
+
+    Returns:
+        Detection results
+    """
+    if len(text) > _DETECT_CACHE_MAX_CHARS:
+        return safety_trigger_detector.detect_sensitive_content(text)
+
+    level, requires_review, flags, flag_mask, matched_terms, recommendation = (
+        _detect_normalized(_normalize_text(text))
+    )
+    return {
+        "sensitivity_level": level,
+        "requires_review": requires_review,
+        "flags": list(flags),
+        "flag_mask": flag_mask,
+        "matched_terms": list(matched_terms),
+        "recommendation": recommendation
+    }
+
+
+async def detect_sensitive_content_async(text: str) -> Dict[str, Any]:
+    """
+    Detect sensitive content without blocking the event loop.
+
     Args:
         text: Text to analyze
 
     Returns:
         Detection results
     """
-    return safety_trigger_detector.detect_sensitive_content(text)
+    return await asyncio.to_thread(detect_sensitive_content, text)
 
 
 def should_interrupt_for_review(text: str) -> Tuple[bool, Dict[str, Any]]:
@@ -1,6 +1,9 @@
 """Authentication request/response schemas."""
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# bcrypt ignores everything past the first 72 bytes of a password
+PASSWORD_MAX_BYTES = 72
 
 
 class UserRegister(BaseModel):
@@ -9,6 +12,14 @@ class UserRegister(BaseModel):
     password: str = Field(min_length=8, max_length=100)
     full_name: str = Field(min_length=1, max_length=255)
 
+    @field_validator("password")
+    @classmethod
+    def password_fits_bcrypt(cls, value: str) -> str:
+        """Reject passwords bcrypt would silently truncate."""
+        if len(value.encode()) > PASSWORD_MAX_BYTES:
+            raise ValueError(f"Password must be at most {PASSWORD_MAX_BYTES} bytes")
+        return value
+
 
 class UserLogin(BaseModel):
     """User login request."""
@@ -42,5 +53,4 @@ class UserResponse(BaseModel):
     is_verified: bool
     firebase_uid: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
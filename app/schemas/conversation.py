@@ -1,6 +1,6 @@
 """Conversation and message request/response schemas."""
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ConversationCreate(BaseModel):
@@ -21,8 +21,7 @@ class MessageResponse(BaseModel):
     content: str
     created_at: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 
 class ConversationResponse(BaseModel):
@@ -34,9 +33,9 @@ class ConversationResponse(BaseModel):
     is_active: bool
     created_at: str
     updated_at: str
+    message_count: Optional[int] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, extra="ignore")
 
 
 class ConversationWithMessages(ConversationResponse):
@@ -51,3 +50,4 @@ class MessageSendResponse(BaseModel):
     requires_human_review: bool
     safety_flags: List[str]
     metadata: Dict[str, Any]
+    title_pending: bool = False  # Auto-title is being generated in the background
@@ -1,21 +1,49 @@
 """Agent service for API integration."""
+import asyncio
 import logging
-from typing import Dict, Any, Optional, AsyncGenerator
-from datetime import datetime
+import secrets
+from typing import Dict, Any, List, Optional, AsyncGenerator, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import Insert, insert
 
 from langchain_openai import AzureChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from app.agents.supervisor import supervisor
+from app.database.queries import messages_for_conversation, owned_child, owned_conversation
+from app.database.session import AsyncSessionLocal
 from app.models.child import Child
 from app.models.conversation import Conversation
 from app.models.message import Message
 from app.config import settings
+from app.services.title_worker import PLACEHOLDER_TITLE, is_placeholder_title, title_worker
 
 logger = logging.getLogger(__name__)
 
+# LLM for title generation; titles are a few words, so keep completions short
+title_llm = AzureChatOpenAI(
+    azure_deployment=settings.azure_openai_deployment,
+    azure_endpoint=settings.azure_openai_endpoint,
+    api_key=settings.azure_openai_api_key,
+    api_version=settings.azure_openai_api_version,
+    max_tokens=32
+)
+
+_TITLE_SYSTEM_MESSAGE = SystemMessage(content=(
+    "Generate a very short conversation title (3-6 words max). "
+    "Focus on the main topic or concern. No quotes, no punctuation at the end. "
+    "Examples: 'Bedtime Tantrums Help', 'Sibling Rivalry Advice', 'School Anxiety Support'"
+))
+
+
+def _user_message_insert(conversation_id: int, content: str) -> Insert:
+    """Build the INSERT for a parent's message."""
+    return insert(Message).values(
+        conversation_id=conversation_id,
+        role="user",
+        content=content
+    )
+
 
 class AgentService:
     """
@@ -29,23 +57,6 @@ class AgentService:
     - Auto-generating conversation titles
     """
 
-    def __init__(self):
-        """Initialize the agent service with LLM for title generation."""
-        self._title_llm = None
-
-    @property
-    def title_llm(self):
-        """Lazy-load LLM for title generation."""
-        if self._title_llm is None:
-            self._title_llm = AzureChatOpenAI(
-                azure_deployment=settings.azure_openai_deployment,
-                azure_endpoint=settings.azure_openai_endpoint,
-                api_key=settings.azure_openai_api_key,
-                api_version=settings.azure_openai_api_version,
-                max_tokens=150
-            )
-        return self._title_llm
-
     async def generate_conversation_title(
         self,
         user_message: str,
@@ -63,35 +74,154 @@ class AgentService:
         """
         try:
             messages = [
-                SystemMessage(content=(
-                    "Generate a very short conversation title (3-6 words max). "
-                    "Focus on the main topic or concern. No quotes, no punctuation at the end. "
-                    "Examples: 'Bedtime Tantrums Help', 'Sibling Rivalry Advice', 'School Anxiety Support'"
-                )),
+                _TITLE_SYSTEM_MESSAGE,
                 HumanMessage(content=f"User asked: {user_message[:200]}\n\nAssistant replied about: {ai_response[:200]}")
             ]
 
-            response = await self.title_llm.ainvoke(messages)
+            response = await title_llm.ainvoke(messages)
             title = response.content.strip().strip('"\'')
 
             # Ensure reasonable length
             if len(title) > 50:
                 title = title[:47] + "..."
 
-            return title if title else "New Conversation"
+            # An empty title would leave the placeholder and be retried forever
+            if title:
+                return title
 
         except Exception as e:
             logger.warning(f"Failed to generate title: {e}")
-            # Fallback: use first few words of user message
-            words = user_message.split()[:5]
-            return " ".join(words) + ("..." if len(words) == 5 else "")
+
+        # Fallback: use first few words of user message
+        words = user_message.split()[:5]
+        return " ".join(words) + ("..." if len(words) == 5 else "")
+
+    async def _insert_user_message(self, conversation_id: int, content: str) -> None:
+        """
+        Store the parent's message using a dedicated session.
+
+        Runs concurrently with the workflow, so it can't share the request
+        session (an AsyncSession doesn't allow concurrent statements).
+
+        Args:
+            conversation_id: Conversation ID
+            content: Message content
+        """
+        async with AsyncSessionLocal() as session:
+            await session.execute(_user_message_insert(conversation_id, content))
+            await session.commit()
+
+    async def _finish_user_insert(
+        self,
+        db: AsyncSession,
+        user_insert: "asyncio.Task[None]",
+        conversation_id: int,
+        content: str
+    ) -> None:
+        """
+        Wait for the concurrent user-message insert, retrying it on db if it failed.
+
+        The retry runs on the request session ahead of the assistant reply,
+        so the whole exchange is still stored, in order, by the next commit.
+
+        Args:
+            db: Request database session
+            user_insert: Task running _insert_user_message
+            conversation_id: Conversation ID
+            content: Message content
+        """
+        try:
+            await user_insert
+        except Exception as e:
+            logger.warning(
+                f"User message insert failed for conversation {conversation_id}, "
+                f"retrying on the request session: {type(e).__name__}: {e}"
+            )
+            await db.execute(_user_message_insert(conversation_id, content))
+
+    def _claim_first_exchange(self, conversation: Conversation) -> bool:
+        """
+        Mark the first exchange as done and decide whether to auto-title.
+
+        Args:
+            conversation: Conversation being replied to
+
+        Returns:
+            True if this is the first exchange and the title is still a placeholder
+        """
+        if conversation.first_exchange_done:
+            return False
+        conversation.first_exchange_done = True
+        return is_placeholder_title(conversation.title)
+
+    async def _insert_assistant_message(
+        self,
+        db: AsyncSession,
+        conversation_id: int,
+        content: str,
+        extra_data: Dict[str, Any]
+    ) -> int:
+        """
+        Store an assistant reply with a Core INSERT ... RETURNING.
+
+        The reply is only reported back by id, so no ORM instance is built.
+
+        Args:
+            db: Database session
+            conversation_id: Conversation ID
+            content: Reply content
+            extra_data: Message metadata
+
+        Returns:
+            ID of the new message
+        """
+        result = await db.execute(
+            insert(Message)
+            .values(
+                conversation_id=conversation_id,
+                role="assistant",
+                content=content,
+                extra_data=extra_data
+            )
+            .returning(Message.id)
+        )
+        return result.scalar_one()
+
+    async def get_owned_conversation(
+        self,
+        db: AsyncSession,
+        conversation_id: int,
+        user_id: int
+    ) -> Conversation:
+        """
+        Load a conversation and its child in one query, checking ownership.
+
+        Args:
+            db: Database session
+            conversation_id: Conversation ID
+            user_id: Parent user ID
+
+        Returns:
+            Conversation with `child` populated
+
+        Raises:
+            PermissionError: If the conversation doesn't exist or isn't the user's
+        """
+        result = await db.execute(owned_conversation(conversation_id, user_id))
+        conversation = result.scalar_one_or_none()
+
+        # Missing and foreign conversations are indistinguishable to the caller
+        if conversation is None:
+            raise PermissionError("Not authorized to access this conversation")
+        return conversation
 
     async def send_message(
         self,
         db: AsyncSession,
         conversation_id: int,
         user_id: int,
-        content: str
+        content: str,
+        conversation: Optional[Conversation] = None
     ) -> Dict[str, Any]:
         """
         Send a message and get AI response.
@@ -101,39 +231,46 @@ class AgentService:
             conversation_id: Conversation ID
             user_id: Parent user ID
             content: Message content
+            conversation: Result of get_owned_conversation() if the caller
+                already checked ownership; looked up when omitted
 
         Returns:
             Dictionary with response and metadata
         """
-        # Get conversation with child info
-        result = await db.execute(
-            select(Conversation).where(Conversation.id == conversation_id)
-        )
-        conversation = result.scalar_one_or_none()
+        if conversation is None:
+            conversation = await self.get_owned_conversation(db, conversation_id, user_id)
+        return await self._send_message_inner(db, conversation, conversation.child, user_id, content)
 
-        if not conversation:
-            raise ValueError(f"Conversation {conversation_id} not found")
+    async def _send_message_inner(
+        self,
+        db: AsyncSession,
+        conversation: Conversation,
+        child: Child,
+        user_id: int,
+        content: str
+    ) -> Dict[str, Any]:
+        """
+        Send a message in a conversation whose ownership is already verified.
 
-        # Verify ownership
-        result = await db.execute(
-            select(Child).where(Child.id == conversation.child_id)
-        )
-        child = result.scalar_one_or_none()
+        Args:
+            db: Database session
+            conversation: Loaded conversation owned by user_id
+            child: The conversation's child
+            user_id: Parent user ID
+            content: Message content
 
-        if not child or child.parent_id != user_id:
-            raise PermissionError("Not authorized to access this conversation")
+        Returns:
+            Dictionary with response and metadata
+        """
+        conversation_id = conversation.id
 
-        # Save user message to database
-        user_message = Message(
-            conversation_id=conversation_id,
-            role="user",
-            content=content
-        )
-        db.add(user_message)
-        # Commit user message before workflow to avoid deadlock with AsyncPostgresStore setup
-        # (CREATE INDEX CONCURRENTLY waits for all open transactions)
+        # End the request transaction before the workflow to avoid deadlock with
+        # AsyncPostgresStore setup (CREATE INDEX CONCURRENTLY waits for all open transactions)
         await db.commit()
 
+        # Save user message on its own session while the workflow runs
+        user_insert = asyncio.create_task(self._insert_user_message(conversation_id, content))
+
         try:
             logger.info(f"Processing message for child {child.id}, age {child.age_years}")
             
@@ -149,51 +286,30 @@ class AgentService:
 
             logger.info(f"Supervisor returned response successfully")
 
+            # The user message must be stored (and get its id) before the reply
+            await self._finish_user_insert(db, user_insert, conversation_id, content)
+
+            title_pending = self._claim_first_exchange(conversation)
+
             # Save AI response to database
-            ai_message = Message(
-                conversation_id=conversation_id,
-                role="assistant",
-                content=result["response"],
-                extra_data=str(result.get("metadata", {}))  # Store as JSON string
+            message_id = await self._insert_assistant_message(
+                db, conversation_id, result["response"], result.get("metadata") or {}
             )
-            db.add(ai_message)
-
-            # Update conversation timestamp
-            conversation.updated_at = datetime.now()
-
-            # Auto-generate title on first message exchange
-            new_title = None
-            if conversation.title == "New Conversation" or conversation.title.startswith("Chat about"):
-                # Count messages to confirm this is the first exchange
-                msg_count_result = await db.execute(
-                    select(func.count(Message.id)).where(Message.conversation_id == conversation_id)
-                )
-                msg_count = msg_count_result.scalar()
-
-                # If this is the first exchange (user message + AI response = 2 messages including the one we just added)
-                if msg_count <= 2:
-                    logger.info(f"Generating auto-title for conversation {conversation_id}")
-                    new_title = await self.generate_conversation_title(
-                        user_message=content,
-                        ai_response=result["response"]
-                    )
-                    conversation.title = new_title
-                    logger.info(f"Auto-generated title: {new_title}")
-
             await db.commit()
 
+            # Title is generated in the background once the exchange is stored
+            if title_pending:
+                title_worker.enqueue(conversation_id)
+
             response_data = {
-                "message_id": ai_message.id,
+                "message_id": message_id,
                 "content": result["response"],
                 "requires_human_review": result.get("requires_human_review", False),
                 "safety_flags": result.get("safety_flags", []),
-                "metadata": result.get("metadata", {})
+                "metadata": result.get("metadata", {}),
+                "title_pending": title_pending
             }
 
-            # Include new title if generated
-            if new_title:
-                response_data["new_title"] = new_title
-
             return response_data
 
         except Exception as e:
@@ -201,13 +317,19 @@ class AgentService:
             await db.rollback()
             raise e
 
+        finally:
+            # Keep the parent's message even when the workflow fails or the
+            # request is cancelled (client disconnect); never leave it detached
+            await asyncio.gather(user_insert, return_exceptions=True)
+
     async def send_message_stream(
         self,
         db: AsyncSession,
         conversation_id: int,
         user_id: int,
-        content: str
-    ) -> AsyncGenerator[Dict[str, Any], None]:
+        content: str,
+        conversation: Optional[Conversation] = None
+    ) -> AsyncGenerator[Union[str, Dict[str, Any]], None]:
         """
         Send a message and stream AI response token by token.
 
@@ -216,45 +338,30 @@ class AgentService:
             conversation_id: Conversation ID
             user_id: Parent user ID
             content: Message content
+            conversation: Result of get_owned_conversation() if the caller
+                already checked ownership; looked up when omitted
 
         Yields:
-            Dictionary with event type and data:
-            - {"type": "token", "data": {"content": "..."}}
-            - {"type": "metadata", "data": {...}}
+            Response tokens as plain strings (the hot path, no wrapper dict),
+            and other events as dictionaries with event type and data:
+            - {"type": "status", "data": {...}}
             - {"type": "done", "data": {...}}
         """
-        # Get conversation with child info
-        result = await db.execute(
-            select(Conversation).where(Conversation.id == conversation_id)
-        )
-        conversation = result.scalar_one_or_none()
-
-        if not conversation:
-            raise ValueError(f"Conversation {conversation_id} not found")
-
-        # Verify ownership
-        result = await db.execute(
-            select(Child).where(Child.id == conversation.child_id)
-        )
-        child = result.scalar_one_or_none()
+        if conversation is None:
+            conversation = await self.get_owned_conversation(db, conversation_id, user_id)
+        child = conversation.child
 
-        if not child or child.parent_id != user_id:
-            raise PermissionError("Not authorized to access this conversation")
-
-        # Save user message to database
-        user_message = Message(
-            conversation_id=conversation_id,
-            role="user",
-            content=content
-        )
-        db.add(user_message)
+        # End the request transaction before the workflow (see _send_message_inner)
         await db.commit()
 
+        # Save user message on its own session while the workflow streams
+        user_insert = asyncio.create_task(self._insert_user_message(conversation_id, content))
+
         try:
             logger.info(f"Processing streaming message for child {child.id}, age {child.age_years}")
 
-            # Collect the full response for saving
-            full_response = ""
+            # Collect the response tokens for saving; joined once when done
+            parts: List[str] = []
             message_id = None
 
             # Process through supervisor agent with streaming
@@ -271,48 +378,30 @@ class AgentService:
                 if event_type == "token":
                     # Yield token to client
                     token = event.get("content", "")
-                    full_response += token
-                    yield {"type": "token", "data": {"content": token}}
+                    parts.append(token)
+                    yield token
 
                 elif event_type == "analysis_complete":
                     # Analysis phase complete, synthesis starting
                     yield {"type": "status", "data": {"status": "generating"}}
 
                 elif event_type == "done":
-                    # Stream complete, save message
+                    # Stream complete, save message after the user message
                     metadata = event.get("metadata", {})
+                    full_response = "".join(parts)
+                    await self._finish_user_insert(db, user_insert, conversation_id, content)
+
+                    title_pending = self._claim_first_exchange(conversation)
 
                     # Save AI response to database
-                    ai_message = Message(
-                        conversation_id=conversation_id,
-                        role="assistant",
-                        content=full_response,
-                        extra_data=str(metadata)
+                    message_id = await self._insert_assistant_message(
+                        db, conversation_id, full_response, metadata
                     )
-                    db.add(ai_message)
-
-                    # Update conversation timestamp
-                    conversation.updated_at = datetime.now()
-
-                    # Auto-generate title on first message exchange
-                    new_title = None
-                    if conversation.title == "New Conversation" or conversation.title.startswith("Chat about"):
-                        msg_count_result = await db.execute(
-                            select(func.count(Message.id)).where(Message.conversation_id == conversation_id)
-                        )
-                        msg_count = msg_count_result.scalar()
-
-                        if msg_count <= 2:
-                            logger.info(f"Generating auto-title for conversation {conversation_id}")
-                            new_title = await self.generate_conversation_title(
-                                user_message=content,
-                                ai_response=full_response
-                            )
-                            conversation.title = new_title
-                            logger.info(f"Auto-generated title: {new_title}")
-
                     await db.commit()
-                    message_id = ai_message.id
+
+                    # Title is generated in the background once the exchange is stored
+                    if title_pending:
+                        title_worker.enqueue(conversation_id)
 
                     # Yield final metadata
                     yield {
@@ -321,7 +410,7 @@ class AgentService:
                             "message_id": message_id,
                             "requires_human_review": metadata.get("requires_human_review", False),
                             "safety_flags": metadata.get("safety_flags", []),
-                            "new_title": new_title
+                            "title_pending": title_pending
                         }
                     }
 
@@ -330,6 +419,11 @@ class AgentService:
             await db.rollback()
             raise e
 
+        finally:
+            # Keep the parent's message even when the workflow fails or the
+            # request is cancelled (client disconnect); never leave it detached
+            await asyncio.gather(user_insert, return_exceptions=True)
+
     async def create_conversation(
         self,
         db: AsyncSession,
@@ -350,23 +444,20 @@ class AgentService:
             Created conversation data
         """
         # Verify child belongs to user
-        result = await db.execute(
-            select(Child).where(Child.id == child_id)
-        )
+        result = await db.execute(owned_child(child_id, user_id))
         child = result.scalar_one_or_none()
 
-        if not child or child.parent_id != user_id:
+        if not child:
             raise PermissionError("Not authorized to create conversation for this child")
 
         # Generate thread ID
-        import uuid
-        thread_id = f"thread_{child_id}_{uuid.uuid4().hex[:8]}"
+        thread_id = f"thread_{child_id}_{secrets.token_hex(4)}"
 
         # Create conversation
-        title = "New Conversation"
+        title = PLACEHOLDER_TITLE
         if initial_message:
             # Use first 50 chars as title
-            title = initial_message[:50] + ("..." if len(initial_message) > 50 else "")
+            title = initial_message if len(initial_message) <= 50 else initial_message[:50] + "..."
 
         conversation = Conversation(
             child_id=child_id,
@@ -378,14 +469,9 @@ class AgentService:
         db.add(conversation)
         await db.flush()
 
-        # If initial message provided, process it
+        # If initial message provided, process it; ownership was checked above
         if initial_message:
-            await self.send_message(
-                db=db,
-                conversation_id=conversation.id,
-                user_id=user_id,
-                content=initial_message
-            )
+            await self._send_message_inner(db, conversation, child, user_id, initial_message)
 
         await db.commit()
 
@@ -402,7 +488,8 @@ class AgentService:
         db: AsyncSession,
         conversation_id: int,
         user_id: int,
-        limit: int = 50
+        limit: int = 50,
+        after_id: Optional[int] = None
     ) -> list[Dict[str, Any]]:
         """
         Get conversation message history.
@@ -412,45 +499,20 @@ class AgentService:
             conversation_id: Conversation ID
             user_id: Parent user ID
             limit: Maximum messages to return
+            after_id: Return messages after this id (keyset pagination)
 
         Returns:
-            List of messages
+            List of message dicts; created_at stays a datetime, which the
+            ORJSONResponse layer serializes natively
         """
         # Verify access
-        result = await db.execute(
-            select(Conversation).where(Conversation.id == conversation_id)
-        )
-        conversation = result.scalar_one_or_none()
-
-        if not conversation:
-            raise ValueError(f"Conversation {conversation_id} not found")
-
-        result = await db.execute(
-            select(Child).where(Child.id == conversation.child_id)
-        )
-        child = result.scalar_one_or_none()
-
-        if not child or child.parent_id != user_id:
-            raise PermissionError("Not authorized to access this conversation")
+        await self.get_owned_conversation(db, conversation_id, user_id)
 
         # Get messages - order by id (more reliable than timestamp)
-        result = await db.execute(
-            select(Message)
-            .where(Message.conversation_id == conversation_id)
-            .order_by(Message.id.asc())
-            .limit(limit)
-        )
-        messages = result.scalars().all()
-
-        return [
-            {
-                "id": msg.id,
-                "role": msg.role,
-                "content": msg.content,
-                "created_at": msg.created_at.isoformat()
-            }
-            for msg in messages
-        ]
+        result = await db.execute(messages_for_conversation(conversation_id, limit, after_id))
+        messages = result.all()
+
+        return [msg._asdict() for msg in messages]
 
 
 # Global service instance
@@ -0,0 +1,177 @@
+"""Background conversation title generation."""
+import asyncio
+import logging
+from typing import Dict, List, Set
+
+from sqlalchemy import ColumnElement, or_, select, update
+
+from app.config import settings
+from app.database.session import AsyncSessionLocal
+from app.models.conversation import Conversation
+from app.models.message import Message
+
+logger = logging.getLogger(__name__)
+
+# Title a conversation carries until its generated title is stored
+PLACEHOLDER_TITLE = "New Conversation"
+# Older conversations were created with "Chat about ..." placeholders
+_LEGACY_PLACEHOLDER_PREFIX = "Chat about"
+
+
+def is_placeholder_title(title: str) -> bool:
+    """
+    Check whether a conversation is still waiting for a generated title.
+
+    Args:
+        title: Current conversation title
+
+    Returns:
+        True if the title is a placeholder
+    """
+    return title == PLACEHOLDER_TITLE or title.startswith(_LEGACY_PLACEHOLDER_PREFIX)
+
+
+def _placeholder_title_clause() -> ColumnElement[bool]:
+    """SQL form of is_placeholder_title() on the conversations table."""
+    return or_(
+        Conversation.title == PLACEHOLDER_TITLE,
+        Conversation.title.startswith(_LEGACY_PLACEHOLDER_PREFIX)
+    )
+
+
+class TitleWorker:
+    """
+    Generates conversation titles off the request path.
+
+    Send paths enqueue a conversation once its first exchange is stored and
+    return immediately; consumer tasks read that exchange, call the title
+    LLM and write the result on their own session.
+
+    The queue lives in memory, so titles can be lost (full queue, restart,
+    failed write). The write only replaces a placeholder title, which makes
+    enqueueing the same conversation again always safe; the conversation
+    endpoints do so for any conversation still on a placeholder after its
+    first exchange.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Initialize an idle worker; call start() from the app lifespan.
+
+        Args:
+            maxsize: Maximum conversations waiting for a title
+        """
+        self._queue: asyncio.Queue[int] = asyncio.Queue(maxsize=maxsize)
+        self._pending: Set[int] = set()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, workers: int) -> None:
+        """
+        Spawn consumer tasks on the running event loop.
+
+        Args:
+            workers: Number of concurrent consumers
+        """
+        for _ in range(workers):
+            self._tasks.append(asyncio.create_task(self._consume()))
+        logger.info(f"Title worker started with {workers} consumers")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Let the consumers drain the queue, then cancel them.
+
+        Args:
+            timeout: Seconds to wait for queued titles before giving up on them
+        """
+        if self._tasks:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"Title worker stopping with {self._queue.qsize()} titles still queued"
+                )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    def enqueue(self, conversation_id: int) -> None:
+        """
+        Queue a conversation for titling.
+
+        Conversations already queued are skipped. Without running consumers,
+        or with a full queue, the conversation is dropped and keeps its
+        placeholder until it is enqueued again.
+
+        Args:
+            conversation_id: Conversation ID
+        """
+        if conversation_id in self._pending:
+            return
+        if not self._tasks:
+            logger.warning(f"No title consumers running; not titling conversation {conversation_id}")
+            return
+        try:
+            self._queue.put_nowait(conversation_id)
+        except asyncio.QueueFull:
+            logger.warning(f"Title queue full; not titling conversation {conversation_id}")
+            return
+        self._pending.add(conversation_id)
+
+    async def _consume(self) -> None:
+        """Title queued conversations until cancelled."""
+        while True:
+            conversation_id = await self._queue.get()
+            try:
+                await self._title_conversation(conversation_id)
+            except Exception as e:
+                logger.warning(f"Failed to store title for conversation {conversation_id}: {e}")
+            finally:
+                self._pending.discard(conversation_id)
+                self._queue.task_done()
+
+    async def _title_conversation(self, conversation_id: int) -> None:
+        """
+        Generate and store the title for one conversation.
+
+        Args:
+            conversation_id: Conversation ID
+        """
+        # Imported here: agent_service imports this module
+        from app.services.agent_service import agent_service
+
+        # The session is closed before the LLM call so no connection is held
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Message.role, Message.content)
+                .where(Message.conversation_id == conversation_id)
+                .order_by(Message.id)
+                .limit(2)
+            )
+            first_exchange: Dict[str, str] = {}
+            for role, content in result.all():
+                first_exchange.setdefault(role, content)
+
+        if "user" not in first_exchange or "assistant" not in first_exchange:
+            logger.warning(f"Conversation {conversation_id} has no first exchange to title")
+            return
+
+        title = await agent_service.generate_conversation_title(
+            user_message=first_exchange["user"],
+            ai_response=first_exchange["assistant"]
+        )
+
+        # Never overwrite a title stored meanwhile (another consumer, a rename)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                update(Conversation)
+                .where(Conversation.id == conversation_id, _placeholder_title_clause())
+                .values(title=title)
+            )
+            await session.commit()
+        if result.rowcount:
+            logger.info(f"Auto-generated title for conversation {conversation_id}: {title}")
+
+
+# Global worker instance
+title_worker = TitleWorker(settings.title_queue_size)
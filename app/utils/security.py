@@ -1,19 +1,46 @@
 """Security utilities for authentication and authorization."""
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from typing import Optional, Tuple
+import bcrypt
+import jwt
 
 from app.config import settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing; bcrypt only uses the first 72 bytes of a password.
+# Registration rejects longer passwords, but older accounts may have set one
+# when passlib truncated silently, so hashing and verifying truncate the same way.
+_BCRYPT_ROUNDS = 12
+_BCRYPT_MAX_BYTES = 72
+
+# Recent successful verifies, keyed by an HMAC of the plain password so the
+# password itself is never held; per process only
+_VERIFY_CACHE_TTL = 300.0
+_VERIFY_CACHE_SIZE = 4096
+_verify_cache: "OrderedDict[bytes, Tuple[str, float]]" = OrderedDict()
+
+# HMAC key for token signing, encoded once
+_JWT_KEY = settings.jwt_secret_key.encode()
+
+# Recently decoded tokens, keyed by a digest of the token; entries never
+# outlive the token's own exp
+_TOKEN_CACHE_TTL = 60.0
+_TOKEN_CACHE_SIZE = 4096
+_token_cache: "OrderedDict[bytes, Tuple[dict, float]]" = OrderedDict()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
 
+    Successful verifies are cached for _VERIFY_CACHE_TTL seconds per
+    (password, hash) pair, so a changed hash misses the cache. Cache keys
+    are an HMAC under jwt_secret_key, so rotating the secret invalidates
+    every entry.
+
     Args:
         plain_password: Plain text password
         hashed_password: Hashed password from database
@@ -21,7 +48,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    # Firebase-only accounts have no local password
+    if not hashed_password:
+        return False
+
+    key = hmac.new(
+        settings.jwt_secret_key.encode(),
+        plain_password.encode(),
+        hashlib.sha256
+    ).digest()
+
+    # Skip bcrypt if this password matched the same hash recently
+    cached = _verify_cache.get(key)
+    if cached is not None:
+        cached_hash, expires_at = cached
+        if expires_at > time.monotonic() and hmac.compare_digest(cached_hash, hashed_password):
+            return True
+
+    try:
+        matched = bcrypt.checkpw(
+            plain_password.encode()[:_BCRYPT_MAX_BYTES],
+            hashed_password.encode()
+        )
+    except ValueError:
+        # Not a bcrypt hash
+        return False
+    if not matched:
+        return False
+
+    # Only matches are cached, so failed guesses always pay the full cost
+    _verify_cache[key] = (hashed_password, time.monotonic() + _VERIFY_CACHE_TTL)
+    _verify_cache.move_to_end(key)
+    if len(_verify_cache) > _VERIFY_CACHE_SIZE:
+        _verify_cache.popitem(last=False)
+    return True
 
 
 def get_password_hash(password: str) -> str:
@@ -34,7 +94,11 @@ def get_password_hash(password: str) -> str:
     Returns:
         Hashed password
     """
-    return pwd_context.hash(password)
+    hashed = bcrypt.hashpw(
+        password.encode()[:_BCRYPT_MAX_BYTES],
+        bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)
+    )
+    return hashed.decode()
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -58,7 +122,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.jwt_secret_key,
+        _JWT_KEY,
         algorithm=settings.jwt_algorithm
     )
     return encoded_jwt
@@ -80,7 +144,7 @@ def create_refresh_token(data: dict) -> str:
 
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.jwt_secret_key,
+        _JWT_KEY,
         algorithm=settings.jwt_algorithm
     )
     return encoded_jwt
@@ -97,11 +161,29 @@ def decode_token(token: str) -> dict:
         Decoded token payload
 
     Raises:
-        JWTError: If token is invalid or expired
+        jwt.PyJWTError: If token is invalid or expired
     """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+
+    # Tokens already verified skip the signature check and JSON parse
+    cached = _token_cache.get(key)
+    if cached is not None:
+        payload, expires_at = cached
+        if expires_at > now:
+            return dict(payload)
+        del _token_cache[key]
+
     payload = jwt.decode(
         token,
-        settings.jwt_secret_key,
+        _JWT_KEY,
         algorithms=[settings.jwt_algorithm]
     )
-    return payload
+
+    expires_at = now + _TOKEN_CACHE_TTL
+    if "exp" in payload:
+        expires_at = min(expires_at, float(payload["exp"]))
+    _token_cache[key] = (payload, expires_at)
+    if len(_token_cache) > _TOKEN_CACHE_SIZE:
+        _token_cache.popitem(last=False)
+    return dict(payload)
@@ -1,10 +1,9 @@
 """LangGraph workflow for the child behavioral therapist system."""
 import logging
-from typing import Dict, Any, AsyncGenerator
+from typing import Dict, Any, AsyncGenerator, List
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 
-from app.config import settings
 from app.workflow.state import TherapistState
 from app.workflow.nodes import (
     parse_input,
@@ -20,6 +19,11 @@ from app.workflow.nodes import (
 
 logger = logging.getLogger(__name__)
 
+# Compiled graphs are stateless (no checkpointer), so each is built once and
+# shared across invocations
+_compiled_workflow = None
+_compiled_analysis_workflow = None
+
 
 def create_therapist_workflow():
     """
@@ -28,11 +32,11 @@ def create_therapist_workflow():
     Workflow:
     1. Parse Input → Extract concern and emotional state
     2. Route to Agents → Decide which subagents to call
-    3. Call Behavior Analyst → Analyze patterns (parallel)
-    4. Apply Psychological Perspective → Load skills (parallel)
-    5. Call Material Consultant → Get recommendations (parallel)
-    6. Safety Check → Flag concerning content
-    7. Synthesize Response → Combine all insights
+    3. Call Behavior Analyst → Analyze patterns
+    4. Apply Psychological Perspective → Load skills (parallel with 5)
+    5. Call Material Consultant → Get recommendations (parallel with 4)
+    6. Synthesize Response → Combine all insights
+    7. Safety Check → Flag concerning content
     8. Format Output → Create final message
     """
 
@@ -52,12 +56,16 @@ def create_therapist_workflow():
     # Define edges (workflow flow)
     workflow.set_entry_point("parse_input")
 
-    # Sequential flow for critical path
     workflow.add_edge("parse_input", "route_to_agents")
     workflow.add_edge("route_to_agents", "call_behavior_analyst")
+
+    # Both consume the behavior analysis but not each other's output, so fan
+    # out after the analyst and join before synthesis
     workflow.add_edge("call_behavior_analyst", "apply_psychological_perspective")
-    workflow.add_edge("apply_psychological_perspective", "call_material_consultant")
+    workflow.add_edge("call_behavior_analyst", "call_material_consultant")
+    workflow.add_edge("apply_psychological_perspective", "synthesize_response")
     workflow.add_edge("call_material_consultant", "synthesize_response")
+
     workflow.add_edge("synthesize_response", "safety_check")
     workflow.add_edge("safety_check", "format_output")
     workflow.add_edge("format_output", END)
@@ -65,6 +73,15 @@ def create_therapist_workflow():
     return workflow
 
 
+def get_compiled_workflow():
+    """Get the compiled therapist workflow, compiling it on first use."""
+    global _compiled_workflow
+    if _compiled_workflow is None:
+        _compiled_workflow = create_therapist_workflow().compile()
+        logger.info("[WORKFLOW] Workflow compiled")
+    return _compiled_workflow
+
+
 async def run_therapist_workflow(
     child_id: int,
     child_age: int,
@@ -91,10 +108,6 @@ async def run_therapist_workflow(
 
     logger.info(f"[WORKFLOW] Starting workflow for thread {thread_id}")
 
-    # Create the workflow graph
-    workflow = create_therapist_workflow()
-    logger.info("[WORKFLOW] Workflow graph created")
-
     # Initial state
     initial_state = {
         "messages": [HumanMessage(content=user_message)],
@@ -123,14 +136,11 @@ async def run_therapist_workflow(
         }
     }
 
-    logger.info(f"[WORKFLOW] Connecting to postgres: {settings.postgres_connection_string}")
-    
     try:
         # TEMPORARILY: Run without checkpointer to test workflow
         # TODO: Debug checkpointer.setup() hanging issue
-        logger.info("[WORKFLOW] Compiling workflow WITHOUT checkpointer (temporary)")
-        compiled_workflow = workflow.compile()
-        logger.info("[WORKFLOW] Workflow compiled, starting invoke...")
+        compiled_workflow = get_compiled_workflow()
+        logger.info("[WORKFLOW] Starting invoke...")
 
         # Run the workflow (no persistence for now)
         final_state = await compiled_workflow.ainvoke(initial_state)
@@ -161,13 +171,24 @@ def create_analysis_workflow():
     workflow.set_entry_point("parse_input")
     workflow.add_edge("parse_input", "route_to_agents")
     workflow.add_edge("route_to_agents", "call_behavior_analyst")
+    # Independent given the behavior analysis; run concurrently
     workflow.add_edge("call_behavior_analyst", "apply_psychological_perspective")
-    workflow.add_edge("apply_psychological_perspective", "call_material_consultant")
+    workflow.add_edge("call_behavior_analyst", "call_material_consultant")
+    workflow.add_edge("apply_psychological_perspective", END)
     workflow.add_edge("call_material_consultant", END)
 
     return workflow
 
 
+def get_compiled_analysis_workflow():
+    """Get the compiled analysis-only workflow, compiling it on first use."""
+    global _compiled_analysis_workflow
+    if _compiled_analysis_workflow is None:
+        _compiled_analysis_workflow = create_analysis_workflow().compile()
+        logger.info("[WORKFLOW_STREAM] Analysis workflow compiled")
+    return _compiled_analysis_workflow
+
+
 async def run_therapist_workflow_streaming(
     child_id: int,
     child_age: int,
@@ -196,9 +217,8 @@ async def run_therapist_workflow_streaming(
 
     logger.info(f"[WORKFLOW_STREAM] Starting streaming workflow for thread {thread_id}")
 
-    # Create analysis-only workflow
-    analysis_workflow = create_analysis_workflow()
-    compiled_analysis = analysis_workflow.compile()
+    # Analysis-only workflow
+    compiled_analysis = get_compiled_analysis_workflow()
 
     # Initial state
     initial_state = {
@@ -231,10 +251,12 @@ async def run_therapist_workflow_streaming(
         yield {"type": "analysis_complete"}
 
         # Now stream the synthesis
-        full_response = ""
+        # Join once at the end; repeated str += copies the buffer per token
+        parts: List[str] = []
         async for token in synthesize_response_streaming(analysis_state):
-            full_response += token
+            parts.append(token)
             yield {"type": "token", "content": token}
+        full_response = "".join(parts)
 
         # Apply safety check to the full response
         from app.safety.content_filter import filter_response
@@ -28,6 +28,14 @@ streaming_llm = AzureChatOpenAI(
     streaming=True
 )
 
+# Emotional state keywords in priority order; built once rather than per message
+_EMOTIONAL_INDICATORS = (
+    ("worried", ("worried", "concerned", "anxious", "scared")),
+    ("frustrated", ("frustrated", "annoyed", "tired", "exhausted")),
+    ("confused", ("confused", "don't know", "not sure", "help")),
+    ("calm", ("just wondering", "curious", "question"))
+)
+
 
 async def parse_input(state: TherapistState) -> Dict[str, Any]:
     """
@@ -45,16 +53,9 @@ async def parse_input(state: TherapistState) -> Dict[str, Any]:
     concern = latest_message.content if hasattr(latest_message, 'content') else str(latest_message)
 
     # Detect emotional state (simple keyword detection for now)
-    emotional_indicators = {
-        "worried": ["worried", "concerned", "anxious", "scared"],
-        "frustrated": ["frustrated", "annoyed", "tired", "exhausted"],
-        "confused": ["confused", "don't know", "not sure", "help"],
-        "calm": ["just wondering", "curious", "question"]
-    }
-
     detected_emotion = "neutral"
     concern_lower = concern.lower()
-    for emotion, keywords in emotional_indicators.items():
+    for emotion, keywords in _EMOTIONAL_INDICATORS:
         if any(keyword in concern_lower for keyword in keywords):
             detected_emotion = emotion
             break
@@ -142,7 +143,7 @@ async def apply_psychological_perspective(state: TherapistState) -> Dict[str, An
     """
     active_skills = state.get("active_skills", [])
     if not active_skills:
-        return state
+        return {}
 
     perspectives = []
 
@@ -178,10 +179,9 @@ Explain:
 
     response = await llm.ainvoke(analysis_prompt)
 
-    return {
-        **state,
-        "psychological_perspective": response.content
-    }
+    # Partial update: runs alongside call_material_consultant, so it must
+    # not write back keys the other branch also returns
+    return {"psychological_perspective": response.content}
 
 
 async def call_material_consultant(state: TherapistState) -> Dict[str, Any]:
@@ -191,7 +191,7 @@ async def call_material_consultant(state: TherapistState) -> Dict[str, Any]:
     Node: Resource recommendations.
     """
     if "material_consultant" not in state.get("agents_to_call", []):
-        return state
+        return {}
 
     result = await material_consultant.recommend(
         issue=state["current_concern"],
@@ -199,10 +199,8 @@ async def call_material_consultant(state: TherapistState) -> Dict[str, Any]:
         additional_context=state.get("behavior_analysis", "")
     )
 
-    return {
-        **state,
-        "material_recommendations": result["recommendations"]
-    }
+    # Partial update; runs alongside apply_psychological_perspective
+    return {"material_recommendations": result["recommendations"]}
 
 
 async def safety_check(state: TherapistState) -> Dict[str, Any]:
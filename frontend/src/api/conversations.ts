@@ -35,7 +35,7 @@ export interface SendMessageResponse {
     requires_human_review?: boolean;
     safety_flags?: string[];
     metadata?: Record<string, unknown>;
-    new_title?: string;  // Auto-generated title after first exchange
+    title_pending?: boolean;  // Auto-title is being generated after first exchange
 }
 
 // Streaming event types
@@ -47,7 +47,7 @@ export interface StreamDoneEvent {
     message_id: number;
     requires_human_review: boolean;
     safety_flags: string[];
-    new_title?: string;
+    title_pending?: boolean;
 }
 
 export interface StreamStatusEvent {
@@ -78,8 +78,9 @@ export const conversationsApi = {
     /**
      * Get a single conversation with messages
      */
-    getById: async (id: number): Promise<Conversation> => {
-        const response = await api.get<Conversation>(`/conversations/${id}`);
+    getById: async (id: number, limit?: number): Promise<Conversation> => {
+        const params = limit ? { limit } : {};
+        const response = await api.get<Conversation>(`/conversations/${id}`, { params });
         return response.data;
     },
 
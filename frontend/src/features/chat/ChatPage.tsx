@@ -851,6 +851,10 @@ const ChatPage = ({ isDark, toggleTheme }: ChatPageProps) => {
         try {
             const fullConversation = await conversationsApi.getById(conversation.id);
             setActiveConversation(fullConversation);
+            // Pick up a title generated after the list was loaded
+            setConversations(prev =>
+                prev.map(c => c.id === fullConversation.id ? { ...c, title: fullConversation.title } : c)
+            );
             setMessages(fullConversation.messages || []);
             setSelectedChildId(fullConversation.child_id);
             setIsMobileSidebarOpen(false);
@@ -874,6 +878,43 @@ const ChatPage = ({ isDark, toggleTheme }: ChatPageProps) => {
         }
     };
 
+    // Titles are generated in the background after the first exchange. If the
+    // queue is backed up past these attempts, the next list or conversation
+    // load picks the title up instead.
+    const pollGeneratedTitle = async (conversationId: number, placeholder: string) => {
+        for (let attempt = 0; attempt < 5; attempt++) {
+            await new Promise(resolve => setTimeout(resolve, 1500));
+            try {
+                const { title } = await conversationsApi.getById(conversationId, 1);
+                if (title !== placeholder) {
+                    setConversations(prev =>
+                        prev.map(c => c.id === conversationId ? { ...c, title } : c)
+                    );
+                    setActiveConversation(prev =>
+                        prev && prev.id === conversationId ? { ...prev, title } : prev
+                    );
+                    return;
+                }
+            } catch (error) {
+                console.error('Failed to fetch conversation title:', error);
+                return;
+            }
+        }
+    };
+
+    const refreshConversationTitles = async () => {
+        try {
+            const conversationsData = await conversationsApi.getAll();
+            setConversations(conversationsData);
+            setActiveConversation(prev => {
+                const fresh = prev && conversationsData.find(c => c.id === prev.id);
+                return prev && fresh ? { ...prev, title: fresh.title } : prev;
+            });
+        } catch (error) {
+            console.error('Failed to refresh conversations:', error);
+        }
+    };
+
     const sendMessage = async (content?: string) => {
         const messageContent = content || inputMessage.trim();
         if (!messageContent || !activeConversation || isSending) return;
@@ -934,17 +975,11 @@ const ChatPage = ({ isDark, toggleTheme }: ChatPageProps) => {
                         )
                     );
 
-                    if (event.data.new_title) {
-                        setActiveConversation(prev =>
-                            prev ? { ...prev, title: event.data.new_title! } : null
-                        );
-                        setConversations(prev =>
-                            prev.map(c =>
-                                c.id === activeConversation.id
-                                    ? { ...c, title: event.data.new_title! }
-                                    : c
-                            )
-                        );
+                    if (event.data.title_pending) {
+                        void pollGeneratedTitle(activeConversation.id, activeConversation.title);
+                    } else if (activeConversation.title === 'New Conversation') {
+                        // An earlier poll gave up before the title was stored
+                        void refreshConversationTitles();
                     }
                 } else if (event.type === 'error') {
                     console.error('Stream error:', event.data.error);
@@ -0,0 +1,9 @@
+"""Shared pytest configuration."""
+import os
+
+# Module-level LLM clients are constructed at import time and refuse to start
+# without credentials; tests never reach the network
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "test-key")
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+os.environ.setdefault("AZURE_OPENAI_EMBEDDING_API_KEY", "test-key")
+os.environ.setdefault("AZURE_OPENAI_EMBEDDING_ENDPOINT", "https://example.openai.azure.com")
@@ -0,0 +1,118 @@
+"""Tests for the conversation endpoints."""
+import importlib
+import sys
+import types
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import desc
+
+from app.models.conversation import Conversation
+
+
+@pytest.fixture
+def conversations_module(monkeypatch):
+    """Import the conversations router with a stand-in supervisor (see test_agent_service)."""
+    fake = types.ModuleType("app.agents.supervisor")
+    fake.supervisor = SimpleNamespace()
+    monkeypatch.setitem(sys.modules, "app.agents.supervisor", fake)
+    monkeypatch.delitem(sys.modules, "app.services.agent_service", raising=False)
+    monkeypatch.delitem(sys.modules, "app.api.v1.conversations", raising=False)
+    return importlib.import_module("app.api.v1.conversations")
+
+
+def _conversation(conversation_id, updated_at, last_message_at, title="Bedtime"):
+    return SimpleNamespace(
+        id=conversation_id,
+        child_id=1,
+        thread_id=f"thread_1_{conversation_id}",
+        title=title,
+        first_exchange_done=True,
+        is_active=True,
+        created_at=datetime(2026, 10, 1, 9, 0),
+        updated_at=updated_at,
+        last_message_at=last_message_at,
+        message_count=2
+    )
+
+
+async def test_list_reports_the_timestamp_it_sorts_by(conversations_module):
+    # The title worker's UPDATE bumped updated_at after the last message
+    conv = _conversation(
+        7,
+        updated_at=datetime(2026, 10, 3, 12, 0),
+        last_message_at=datetime(2026, 10, 2, 8, 30)
+    )
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [conv]
+    db = AsyncMock()
+    db.execute.return_value = result
+
+    response = await conversations_module.list_conversations(
+        child_id=None, current_user=SimpleNamespace(id=1), db=db
+    )
+
+    query = db.execute.await_args.args[0]
+    (order_by,) = query._order_by_clauses
+    assert str(order_by) == str(desc(Conversation.last_message_at))
+    assert response[0].updated_at == conv.last_message_at.isoformat()
+
+
+async def test_get_reports_last_message_time_as_updated_at(conversations_module):
+    conv = _conversation(
+        7,
+        updated_at=datetime(2026, 10, 3, 12, 0),
+        last_message_at=datetime(2026, 10, 2, 8, 30)
+    )
+    conversation_result = MagicMock()
+    conversation_result.one_or_none.return_value = (conv, 1)
+    messages_result = MagicMock()
+    messages_result.all.return_value = []
+    db = AsyncMock()
+    db.execute.side_effect = [conversation_result, messages_result]
+
+    response = await conversations_module.get_conversation(
+        conversation_id=7, limit=50, after_id=None,
+        current_user=SimpleNamespace(id=1), db=db
+    )
+
+    assert response.updated_at == conv.last_message_at.isoformat()
+
+
+async def test_list_requeues_conversations_still_on_placeholder_title(conversations_module, monkeypatch):
+    titled = _conversation(7, datetime(2026, 10, 3), datetime(2026, 10, 2))
+    untitled = _conversation(8, datetime(2026, 10, 3), datetime(2026, 10, 2), title="New Conversation")
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [titled, untitled]
+    db = AsyncMock()
+    db.execute.return_value = result
+    enqueued = []
+    monkeypatch.setattr(conversations_module.title_worker, "enqueue", enqueued.append)
+
+    await conversations_module.list_conversations(
+        child_id=None, current_user=SimpleNamespace(id=1), db=db
+    )
+
+    assert enqueued == [8]
+
+
+async def test_get_requeues_conversation_still_on_placeholder_title(conversations_module, monkeypatch):
+    conv = _conversation(8, datetime(2026, 10, 3), datetime(2026, 10, 2), title="New Conversation")
+    conversation_result = MagicMock()
+    conversation_result.one_or_none.return_value = (conv, 1)
+    messages_result = MagicMock()
+    messages_result.all.return_value = []
+    db = AsyncMock()
+    db.execute.side_effect = [conversation_result, messages_result]
+    enqueued = []
+    monkeypatch.setattr(conversations_module.title_worker, "enqueue", enqueued.append)
+
+    response = await conversations_module.get_conversation(
+        conversation_id=8, limit=50, after_id=None,
+        current_user=SimpleNamespace(id=1), db=db
+    )
+
+    assert enqueued == [8]
+    assert response.title == "New Conversation"
@@ -0,0 +1,128 @@
+"""Tests for memory backend configuration."""
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytest
+from psycopg.conninfo import conninfo_to_dict
+
+from app.api.v1 import memories
+from app.config import settings
+from app.memory import backends
+from app.memory.backends import MemoryBackends, get_memory_backends
+
+
+def test_backends_from_sqlalchemy_url_are_psycopg_compatible():
+    memory_backends = MemoryBackends(settings.database_url)
+
+    assert "+asyncpg" not in memory_backends.database_url
+    params = conninfo_to_dict(memory_backends.database_url)
+    assert params["dbname"] == settings.database_url.rsplit("/", 1)[-1]
+
+
+def test_backends_keep_libpq_connection_strings():
+    conn_string = settings.postgres_connection_string
+
+    assert MemoryBackends(conn_string).database_url == conn_string
+
+
+def test_backends_construction_does_not_open_a_pool():
+    assert MemoryBackends(settings.database_url)._pool is None
+
+
+async def test_memory_manager_reuses_shared_backends(monkeypatch):
+    monkeypatch.setattr(backends, "_memory_backends_instance", None)
+
+    first = await memories.get_memory_manager()
+    second = await memories.get_memory_manager()
+
+    assert first.backends is second.backends
+    assert first.backends is get_memory_backends()
+
+
+def _reference_aggregate(patterns, cutoff, midpoint, limit_recent):
+    """The parse-then-compare aggregation aggregate_patterns replaced."""
+    recent = []
+    frequency_counts = defaultdict(int)
+    for pattern_data in patterns:
+        pattern = pattern_data["data"]
+        if datetime.fromisoformat(pattern["last_observed"]) >= cutoff:
+            recent.append(pattern_data)
+            frequency_counts[pattern.get("frequency", "unknown")] += 1
+    time_sorted = sorted(recent, key=lambda x: x["data"]["last_observed"], reverse=True)
+    newer_than_midpoint = sum(
+        1 for p in time_sorted
+        if datetime.fromisoformat(p["data"]["last_observed"]) >= midpoint
+    )
+    return (
+        len(patterns),
+        len(recent),
+        newer_than_midpoint,
+        dict(frequency_counts),
+        time_sorted[:limit_recent]
+    )
+
+
+def _patterns(now, count, seed):
+    rng = random.Random(seed)
+    frequencies = ["daily", "weekly", "monthly", "", None]
+    patterns = []
+    for i in range(count):
+        observed = now - timedelta(days=rng.randint(0, 120), seconds=rng.randint(0, 86400))
+        # Whole seconds drop the microseconds from isoformat()
+        if rng.random() < 0.3:
+            observed = observed.replace(microsecond=0)
+        data = {"pattern": f"pattern {i}", "last_observed": observed.isoformat()}
+        if rng.random() < 0.8:
+            data["frequency"] = rng.choice(frequencies)
+        patterns.append({"key": str(i), "data": data})
+    return patterns
+
+
+@pytest.mark.parametrize("seed", range(5))
+async def test_aggregate_patterns_matches_parsed_datetime_results(monkeypatch, seed):
+    now = datetime(2026, 10, 16, 12, 30, 15, 250000)
+    cutoff = now - timedelta(days=90)
+    midpoint = now - timedelta(days=45)
+    patterns = _patterns(now, 50, seed)
+    # Observations exactly on each boundary, with and without microseconds
+    patterns.append({"key": "at-cutoff", "data": {"last_observed": cutoff.isoformat()}})
+    patterns.append({"key": "at-midpoint", "data": {"last_observed": midpoint.isoformat()}})
+    patterns.append({"key": "before-cutoff", "data": {
+        "last_observed": cutoff.replace(microsecond=0).isoformat(), "frequency": "daily"
+    }})
+
+    memory_backends = MemoryBackends(settings.database_url)
+
+    async def search_memories(**kwargs):
+        return patterns
+
+    monkeypatch.setattr(memory_backends, "search_memories", search_memories)
+
+    result = await memory_backends.aggregate_patterns(
+        child_id=1, query="tantrums", since=cutoff, limit_recent=10, midpoint=midpoint
+    )
+
+    assert result == _reference_aggregate(patterns, cutoff, midpoint, 10)
+
+
+async def test_aggregate_patterns_defaults_only_missing_frequency(monkeypatch):
+    now = datetime.now()
+    patterns = [
+        {"key": "1", "data": {"last_observed": now.isoformat()}},
+        {"key": "2", "data": {"last_observed": now.isoformat(), "frequency": ""}},
+        {"key": "3", "data": {"last_observed": now.isoformat(), "frequency": None}},
+        {"key": "4", "data": {"last_observed": now.isoformat(), "frequency": "daily"}},
+    ]
+    memory_backends = MemoryBackends(settings.database_url)
+
+    async def search_memories(**kwargs):
+        return patterns
+
+    monkeypatch.setattr(memory_backends, "search_memories", search_memories)
+
+    _, _, _, frequency_counts, _ = await memory_backends.aggregate_patterns(
+        child_id=1, query="tantrums", since=now - timedelta(days=1)
+    )
+
+    assert frequency_counts == {"unknown": 1, "": 1, None: 1, "daily": 1}
@@ -0,0 +1,233 @@
+"""Tests for safety trigger detection."""
+import re
+
+import pytest
+
+from app.safety import triggers
+from app.safety.triggers import SafetyTrigger, safety_trigger_detector
+
+
+CATEGORIES = (
+    ("emergency", SafetyTrigger.EMERGENCY_KEYWORDS),
+    ("harm", SafetyTrigger.HARM_KEYWORDS),
+    ("medical_advice", SafetyTrigger.MEDICAL_ADVICE_KEYWORDS),
+    ("medical", SafetyTrigger.MEDICAL_KEYWORDS),
+    ("developmental_concern", SafetyTrigger.DEVELOPMENTAL_KEYWORDS),
+)
+
+# The per-pattern regexes the automaton replaced, run on the original text
+REFERENCE_PATTERNS = tuple(
+    (category, [re.compile(pattern, re.IGNORECASE) for pattern in patterns])
+    for category, patterns in CATEGORIES
+)
+
+
+def reference_detect(text):
+    """Flags and severity exactly as the original regex detector computed them."""
+    flags = [
+        category for category, patterns in REFERENCE_PATTERNS
+        if any(pattern.search(text) for pattern in patterns)
+    ]
+    if not flags:
+        return flags, "safe", False
+    if "emergency" in flags or "harm" in flags:
+        return flags, "critical", True
+    if "medical_advice" in flags or ("developmental_concern" in flags and "medical" in flags):
+        return flags, "high", True
+    return flags, "moderate", True
+
+
+def assert_matches_reference(text):
+    result = safety_trigger_detector.detect_sensitive_content(text)
+    flags, level, requires_review = reference_detect(text)
+    assert result["flags"] == flags, text
+    assert result["sensitivity_level"] == level, text
+    assert result["requires_review"] is requires_review, text
+    assert result["flag_mask"] == triggers.flags_to_mask(flags), text
+    return result
+
+
+TRIGGER_PHRASES = {
+    "emergency": [
+        "this is an emergency", "it feels urgent", "we need immediate help", "a crisis at home",
+        "he is in danger", "that seems dangerous", "the house is unsafe", "we went to the hospital",
+        "I called 911", "the emergency room", "off to the er", "she talked about suicide",
+        "he sounded suicidal", "he said kill myself", "threatened to kill himself",
+        "wants to kill herself",
+    ],
+    "harm": [
+        "signs of abuse", "an abusive uncle", "she was abused", "he hit his sister",
+        "keeps hitting", "they beat him", "a beating", "he hurt the cat", "hurting himself",
+        "talks about self-harm", "mentions self harm", "cutting her arms", "said kill",
+        "child neglect", "felt neglected", "abandoned at the park", "domestic violence",
+        "violent outbursts", "aggression at school", "aggressive play", "childhood trauma",
+        "a traumatic move", "he seems traumatized",
+    ],
+    "medical_advice": [
+        "should I give melatonin", "should we take a break", "should we use a timer",
+        "how much sugar", "the dosage", "one dose", "stop taking vitamins", "stop using the app",
+        "start taking fish oil", "start using stickers", "is it safe to give honey",
+        "safe to take outside", "safe to use screens",
+    ],
+    "medical": [
+        "tested for adhd", "maybe add", "an autism evaluation", "asd screening", "asperger traits",
+        "childhood depression", "separation anxiety", "ptsd symptoms", "ocd habits",
+        "bipolar relatives", "schizophrenia in the family", "a psychosis episode",
+        "a sleep disorder", "a rare syndrome", "the diagnosis", "her medication",
+        "they prescribe it", "a prescription", "a pill", "a drug", "our therapist",
+        "the psychiatrist", "a psychologist", "the doctor",
+    ],
+    "developmental_concern": [
+        "he is not talking", "not speaking yet", "not walking at two", "severe delay",
+        "severely delayed", "severe delayed", "severely delay", "some regression",
+        "regressing lately", "she regressed", "stop eating", "stopped drinking",
+        "stopped sleeping",
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "category,phrase",
+    [(category, phrase) for category, phrases in TRIGGER_PHRASES.items() for phrase in phrases]
+)
+def test_trigger_phrase_matches_original_regexes(category, phrase):
+    result = assert_matches_reference(phrase)
+    assert category in result["flags"]
+
+
+@pytest.mark.parametrize("text", [
+    # Keywords inside longer words
+    "kadhdx", "my mother", "hitch a ride", "hurtle", "dangerously close", "regressive taxes",
+    "the address", "errands", "pills", "drugs", "cuttings", "doses", "killing time",
+    "self-harmful", "adhd_like", "autism2", "9110",
+    # Multi-word phrases need their exact spacing
+    "kill   myself", "kill\nmyself", "not\ttalking", "selfharm",
+    # Nothing sensitive
+    "", "hello", "my kid throws tantrums at bedtime",
+])
+def test_word_boundaries_match_original_regexes(text):
+    assert_matches_reference(text)
+
+
+@pytest.mark.parametrize("text", [
+    "ADHD", "Autism Evaluation", "KILL MYSELF", "He Was HIT", "Should We Give", "ER visit",
+    "SeVeReLy DeLaYeD", "STOPPED EATING",
+    # Characters re.IGNORECASE matched against ASCII keyword letters
+    "SHOULD İ GİVE", "should ı give", "ſuicide", "Kill myself",
+])
+def test_case_matches_original_regexes(text):
+    result = assert_matches_reference(text)
+    assert result["flags"]
+
+
+@pytest.mark.parametrize("text", [
+    "suicide!", "(hospital)", "911?", "adhd,", "\"autism\"", "er.", "hit;", "dose:",
+    "not talking...", "self-harm!", "-trauma-", "[doctor]", "kill myself.",
+])
+def test_punctuation_next_to_phrase_matches_original_regexes(text):
+    result = assert_matches_reference(text)
+    assert result["flags"]
+
+
+@pytest.mark.parametrize("text,flags,level", [
+    ("He has ADHD and is not talking", ["medical", "developmental_concern"], "high"),
+    ("Should I give him a pill?", ["medical_advice", "medical"], "high"),
+    ("He hit me, then we went to the ER", ["emergency", "harm"], "critical"),
+    ("suicide", ["emergency", "harm"], "critical"),
+    ("The doctor said autism; severe delay, and he regressed.", ["medical", "developmental_concern"], "high"),
+    ("urgent: abuse, dosage, adhd, stopped sleeping",
+     ["emergency", "harm", "medical_advice", "medical", "developmental_concern"], "critical"),
+])
+def test_several_triggers_in_one_text(text, flags, level):
+    result = assert_matches_reference(text)
+    assert result["flags"] == flags
+    assert result["sensitivity_level"] == level
+
+
+def test_matched_terms_are_the_keywords_found():
+    result = safety_trigger_detector.detect_sensitive_content("Kill myself, said the ADHD kid")
+    assert sorted(result["matched_terms"]) == ["adhd", "kill", "kill myself"]
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [pattern for _, patterns in CATEGORIES for pattern in patterns]
+)
+def test_every_keyword_pattern_expands_to_literals(pattern):
+    literals = triggers._expand_keyword_pattern(pattern)
+    compiled = re.compile(pattern, re.IGNORECASE)
+    assert literals
+    for literal in literals:
+        assert compiled.fullmatch(literal), literal
+
+
+def test_no_keyword_pattern_falls_back_to_regex():
+    assert triggers._RESIDUAL_PATTERN is None
+
+
+def test_unexpandable_pattern_is_detected_through_regex_fallback(monkeypatch):
+    automaton, residual = triggers._build_scanner((
+        ("emergency", (r"\b(?:call 911)\b", r"\bcode [0-9]+\b")),
+        ("medical", (r"\b(?:doctor)\b",)),
+    ))
+    assert residual is not None
+    assert residual.pattern == r"(?P<emergency>\bcode [0-9]+\b)"
+    monkeypatch.setattr(triggers, "_AUTOMATON", automaton)
+    monkeypatch.setattr(triggers, "_RESIDUAL_PATTERN", residual)
+
+    result = SafetyTrigger().detect_sensitive_content("Doctor says CODE 42")
+
+    assert result["flags"] == ["emergency", "medical"]
+    assert result["sensitivity_level"] == "critical"
+    assert sorted(result["matched_terms"]) == ["code 42", "doctor"]
+
+
+@pytest.fixture
+def detect_cache():
+    """Start each cache test from an empty detection cache."""
+    triggers._detect_normalized.cache_clear()
+    yield triggers._detect_normalized
+    triggers._detect_normalized.cache_clear()
+
+
+@pytest.mark.parametrize("text", [
+    "kill\nmyself", "kill  myself", "not\ttalking", "stopped \n eating",
+    "KILL MYSELF", "Kill myself", "should İ give", "ſuicide", "hello there",
+])
+def test_cached_detection_matches_detector(detect_cache, text):
+    expected = safety_trigger_detector.detect_sensitive_content(text)
+    for _ in range(2):
+        result = triggers.detect_sensitive_content(text)
+        assert result["flags"] == expected["flags"]
+        assert result["flag_mask"] == expected["flag_mask"]
+        assert result["sensitivity_level"] == expected["sensitivity_level"]
+        assert sorted(result["matched_terms"]) == sorted(expected["matched_terms"])
+    assert detect_cache.cache_info().hits == 1
+
+
+def test_phrase_split_across_line_break_does_not_match(detect_cache):
+    result = triggers.detect_sensitive_content("I could kill\nmyself laughing")
+    assert result["flags"] == ["harm"]
+    assert result["matched_terms"] == ["kill"]
+
+
+def test_texts_differing_only_in_case_share_a_cache_entry(detect_cache):
+    triggers.detect_sensitive_content("He has ADHD")
+    triggers.detect_sensitive_content("he has adhd")
+    assert detect_cache.cache_info().currsize == 1
+    assert detect_cache.cache_info().hits == 1
+
+
+def test_cached_result_is_not_shared_with_callers(detect_cache):
+    triggers.detect_sensitive_content("suicide")["flags"].append("tampered")
+    assert triggers.detect_sensitive_content("suicide")["flags"] == ["emergency", "harm"]
+
+
+def test_long_text_is_not_cached(detect_cache):
+    text = "a" * triggers._DETECT_CACHE_MAX_CHARS + " kill myself"
+    result = triggers.detect_sensitive_content(text)
+    assert result["flags"] == ["emergency", "harm"]
+    assert detect_cache.cache_info().currsize == 0
+
+    triggers.detect_sensitive_content("a" * triggers._DETECT_CACHE_MAX_CHARS)
+    assert detect_cache.cache_info().currsize == 1
@@ -0,0 +1,215 @@
+"""Tests for the agent service send paths."""
+import asyncio
+import importlib
+import sys
+import types
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+
+@pytest.fixture
+def agent_module(monkeypatch):
+    """
+    Import app.services.agent_service with a stand-in supervisor.
+
+    The real supervisor module builds a Chroma HTTP client at import time,
+    which needs a running server.
+    """
+    fake = types.ModuleType("app.agents.supervisor")
+    fake.supervisor = SimpleNamespace()
+    monkeypatch.setitem(sys.modules, "app.agents.supervisor", fake)
+    monkeypatch.delitem(sys.modules, "app.services.agent_service", raising=False)
+    return importlib.import_module("app.services.agent_service")
+
+
+@pytest.fixture
+def conversation():
+    """Conversation past its first exchange, so no title is queued."""
+    return SimpleNamespace(
+        id=7,
+        thread_id="thread_1_abcd1234",
+        first_exchange_done=True,
+        title="Bedtime",
+        child=SimpleNamespace(id=1, age_years=5)
+    )
+
+
+class InsertRecorder:
+    """Slow stand-in for _insert_user_message that records completion."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.finished = False
+
+    async def __call__(self, conversation_id, content):
+        self.started.set()
+        await asyncio.sleep(0.05)
+        self.finished = True
+
+
+def _hanging_stream(first_token_sent: asyncio.Event):
+    """Supervisor stream that yields one token and then never finishes."""
+    async def process_message_stream(**kwargs):
+        yield {"type": "token", "content": "Hello"}
+        first_token_sent.set()
+        await asyncio.Event().wait()
+    return process_message_stream
+
+
+async def test_stream_cancelled_mid_stream_finishes_user_insert(agent_module, conversation, monkeypatch):
+    service = agent_module.AgentService()
+    recorder = InsertRecorder()
+    first_token_sent = asyncio.Event()
+    monkeypatch.setattr(service, "_insert_user_message", recorder)
+    monkeypatch.setattr(
+        agent_module.supervisor, "process_message_stream",
+        _hanging_stream(first_token_sent), raising=False
+    )
+    db = AsyncMock()
+
+    async def consume():
+        async for _ in service.send_message_stream(
+            db, conversation.id, 1, "hi", conversation=conversation
+        ):
+            pass
+
+    consumer = asyncio.create_task(consume())
+    await first_token_sent.wait()
+    consumer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await consumer
+
+    # The insert was awaited by the generator, not left running detached
+    assert recorder.finished
+    assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    # Nothing was written on the request session after the cancel
+    db.execute.assert_not_called()
+
+
+async def test_stream_closed_by_client_finishes_user_insert(agent_module, conversation, monkeypatch):
+    service = agent_module.AgentService()
+    recorder = InsertRecorder()
+    monkeypatch.setattr(service, "_insert_user_message", recorder)
+
+    async def process_message_stream(**kwargs):
+        yield {"type": "token", "content": "Hello"}
+        yield {"type": "token", "content": " there"}
+
+    monkeypatch.setattr(
+        agent_module.supervisor, "process_message_stream", process_message_stream, raising=False
+    )
+    db = AsyncMock()
+
+    stream = service.send_message_stream(db, conversation.id, 1, "hi", conversation=conversation)
+    assert await stream.__anext__() == "Hello"
+    # A disconnecting SSE client closes the generator at the yield
+    await stream.aclose()
+
+    assert recorder.finished
+    db.execute.assert_not_called()
+
+
+async def test_send_message_failure_keeps_user_message(agent_module, conversation, monkeypatch):
+    service = agent_module.AgentService()
+    recorder = InsertRecorder()
+    monkeypatch.setattr(service, "_insert_user_message", recorder)
+    monkeypatch.setattr(
+        agent_module.supervisor, "process_message",
+        AsyncMock(side_effect=RuntimeError("workflow failed")), raising=False
+    )
+    db = AsyncMock()
+
+    with pytest.raises(RuntimeError):
+        await service.send_message(db, conversation.id, 1, "hi", conversation=conversation)
+
+    assert recorder.finished
+    db.rollback.assert_awaited_once()
+
+
+class FailingInsert:
+    """Stand-in for _insert_user_message whose dedicated session fails."""
+
+    async def __call__(self, conversation_id, content):
+        raise ConnectionError("user insert failed")
+
+
+def _recording_db(calls):
+    """Request session that records statements and commits in order."""
+    db = AsyncMock()
+
+    async def execute(statement):
+        calls.append(("execute", statement.table.name, statement.compile().params))
+
+    async def commit():
+        calls.append(("commit",))
+
+    db.execute.side_effect = execute
+    db.commit.side_effect = commit
+    return db
+
+
+def _recording_assistant_insert(calls):
+    async def insert_assistant_message(db, conversation_id, content, extra_data):
+        calls.append(("assistant", content))
+        return 99
+    return insert_assistant_message
+
+
+async def test_send_message_retries_failed_user_insert_on_request_session(
+    agent_module, conversation, monkeypatch
+):
+    service = agent_module.AgentService()
+    calls = []
+    monkeypatch.setattr(service, "_insert_user_message", FailingInsert())
+    monkeypatch.setattr(service, "_insert_assistant_message", _recording_assistant_insert(calls))
+    monkeypatch.setattr(
+        agent_module.supervisor, "process_message",
+        AsyncMock(return_value={"response": "Try a routine"}), raising=False
+    )
+    db = _recording_db(calls)
+
+    response = await service.send_message(db, conversation.id, 1, "hi", conversation=conversation)
+
+    assert response["message_id"] == 99
+    # Before-workflow commit, then the retried user message ahead of the reply
+    assert calls[1:] == [
+        ("execute", "messages", {"conversation_id": 7, "role": "user", "content": "hi"}),
+        ("assistant", "Try a routine"),
+        ("commit",),
+    ]
+    db.rollback.assert_not_awaited()
+
+
+async def test_stream_retries_failed_user_insert_on_request_session(
+    agent_module, conversation, monkeypatch
+):
+    service = agent_module.AgentService()
+    calls = []
+    monkeypatch.setattr(service, "_insert_user_message", FailingInsert())
+    monkeypatch.setattr(service, "_insert_assistant_message", _recording_assistant_insert(calls))
+
+    async def process_message_stream(**kwargs):
+        yield {"type": "token", "content": "Hello"}
+        yield {"type": "done", "metadata": {}}
+
+    monkeypatch.setattr(
+        agent_module.supervisor, "process_message_stream", process_message_stream, raising=False
+    )
+    db = _recording_db(calls)
+
+    events = [
+        event async for event in service.send_message_stream(
+            db, conversation.id, 1, "hi", conversation=conversation
+        )
+    ]
+
+    assert events[0] == "Hello"
+    assert events[-1]["type"] == "done"
+    assert events[-1]["data"]["message_id"] == 99
+    assert calls[1:] == [
+        ("execute", "messages", {"conversation_id": 7, "role": "user", "content": "hi"}),
+        ("assistant", "Hello"),
+        ("commit",),
+    ]
@@ -0,0 +1,194 @@
+"""Tests for the background title worker."""
+import asyncio
+import sys
+import types
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.sql import Select, Update
+
+from app.services import title_worker as title_worker_module
+from app.services.title_worker import TitleWorker, is_placeholder_title
+
+
+class FakeSession:
+    """Async session stand-in that records statements and commits."""
+
+    def __init__(self, log, rows, fail_update):
+        self.log = log
+        self.rows = rows
+        self.fail_update = fail_update
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        self.log.append(statement)
+        if isinstance(statement, Select):
+            result = MagicMock()
+            result.all.return_value = self.rows
+            return result
+        if self.fail_update:
+            raise ConnectionError("database unavailable")
+        return SimpleNamespace(rowcount=1)
+
+    async def commit(self):
+        self.log.append("commit")
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """Route the worker's sessions to FakeSession; returns the shared state."""
+    state = SimpleNamespace(
+        log=[],
+        rows=[("user", "He won't sleep"), ("assistant", "Try a wind-down routine")],
+        fail_update=False
+    )
+    monkeypatch.setattr(
+        title_worker_module, "AsyncSessionLocal",
+        lambda: FakeSession(state.log, state.rows, state.fail_update)
+    )
+    return state
+
+
+@pytest.fixture
+def generate_title(monkeypatch):
+    """Stand-in agent_service (the real module needs a Chroma server to import)."""
+    generate = AsyncMock(return_value="Bedtime Routine Help")
+    fake = types.ModuleType("app.services.agent_service")
+    fake.agent_service = SimpleNamespace(generate_conversation_title=generate)
+    monkeypatch.setitem(sys.modules, "app.services.agent_service", fake)
+    return generate
+
+
+def _updates(log):
+    return [statement for statement in log if isinstance(statement, Update)]
+
+
+async def test_enqueued_conversation_gets_title_written(database, generate_title):
+    worker = TitleWorker(maxsize=10)
+    worker.start(1)
+
+    worker.enqueue(7)
+    await worker.stop()
+
+    generate_title.assert_awaited_once_with(
+        user_message="He won't sleep", ai_response="Try a wind-down routine"
+    )
+    (update,) = _updates(database.log)
+    params = update.compile().params
+    assert params["title"] == "Bedtime Routine Help"
+    # Only a placeholder title is replaced, so enqueueing again is harmless
+    assert 7 in params.values()
+    assert "New Conversation" in params.values()
+    assert "conversations.title" in str(update.whereclause)
+    assert database.log[-1] == "commit"
+
+
+async def test_failed_title_is_logged_and_can_be_requeued(database, generate_title, caplog):
+    generate_title.side_effect = [RuntimeError("llm down"), "Bedtime Routine Help"]
+    worker = TitleWorker(maxsize=10)
+    worker.start(1)
+
+    worker.enqueue(7)
+    await asyncio.wait_for(worker._queue.join(), 1)
+    assert not _updates(database.log)
+    assert "Failed to store title for conversation 7" in caplog.text
+
+    # The consumer survived and the conversation can be queued again
+    worker.enqueue(7)
+    await worker.stop()
+    assert len(_updates(database.log)) == 1
+
+
+async def test_failed_write_does_not_stop_the_consumer(database, generate_title, caplog):
+    database.fail_update = True
+    worker = TitleWorker(maxsize=10)
+    worker.start(1)
+
+    worker.enqueue(7)
+    worker.enqueue(8)
+    await worker.stop()
+
+    assert generate_title.await_count == 2
+    assert "Failed to store title for conversation 8" in caplog.text
+
+
+async def test_conversation_without_first_exchange_is_skipped(database, generate_title):
+    database.rows = [("user", "He won't sleep")]
+    worker = TitleWorker(maxsize=10)
+    worker.start(1)
+
+    worker.enqueue(7)
+    await worker.stop()
+
+    generate_title.assert_not_awaited()
+    assert not _updates(database.log)
+
+
+async def test_stop_drains_queued_titles(database, generate_title):
+    worker = TitleWorker(maxsize=10)
+    worker.start(2)
+
+    for conversation_id in range(5):
+        worker.enqueue(conversation_id)
+    await worker.stop()
+
+    assert generate_title.await_count == 5
+    assert len(_updates(database.log)) == 5
+    assert not worker._tasks
+
+
+async def test_stop_gives_up_on_titles_after_timeout(database, generate_title, caplog):
+    async def hang(**kwargs):
+        await asyncio.Event().wait()
+
+    generate_title.side_effect = hang
+    worker = TitleWorker(maxsize=10)
+    worker.start(1)
+
+    worker.enqueue(7)
+    worker.enqueue(8)
+    await worker.stop(timeout=0.05)
+
+    assert not worker._tasks
+    assert not _updates(database.log)
+    assert "1 titles still queued" in caplog.text
+
+
+def test_enqueue_without_consumers_drops(caplog):
+    worker = TitleWorker(maxsize=10)
+
+    worker.enqueue(7)
+
+    assert worker._queue.empty()
+    assert "No title consumers running" in caplog.text
+
+
+async def test_enqueue_skips_queued_conversation_and_drops_when_full(caplog):
+    worker = TitleWorker(maxsize=2)
+    # Consumers count as running without draining the queue
+    worker._tasks.append(asyncio.create_task(asyncio.Event().wait()))
+
+    worker.enqueue(7)
+    worker.enqueue(7)
+    worker.enqueue(8)
+    worker.enqueue(9)
+
+    assert worker._queue.qsize() == 2
+    assert "Title queue full; not titling conversation 9" in caplog.text
+    await worker.stop(timeout=0.01)
+
+
+@pytest.mark.parametrize("title,expected", [
+    ("New Conversation", True),
+    ("Chat about bedtime", True),
+    ("Bedtime Routine Help", False),
+    ("new conversation", False),
+])
+def test_is_placeholder_title(title, expected):
+    assert is_placeholder_title(title) is expected
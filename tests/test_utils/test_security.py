@@ -0,0 +1,222 @@
+"""Tests for password and token security utilities."""
+import base64
+import json
+import time
+
+import bcrypt
+import jwt
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.auth import UserLogin, UserRegister
+from app.utils import security
+
+
+def _hash(password: str) -> str:
+    """Cheap bcrypt hash so tests stay fast."""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=4)).decode()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    security._verify_cache.clear()
+    security._token_cache.clear()
+    yield
+    security._verify_cache.clear()
+    security._token_cache.clear()
+
+
+@pytest.fixture
+def checkpw_calls(monkeypatch):
+    """Count calls that reach bcrypt."""
+    calls = []
+    real_checkpw = bcrypt.checkpw
+
+    def counting_checkpw(password, hashed_password):
+        calls.append(password)
+        return real_checkpw(password, hashed_password)
+
+    monkeypatch.setattr(security.bcrypt, "checkpw", counting_checkpw)
+    return calls
+
+
+def test_verify_password_caches_successful_verify(checkpw_calls):
+    hashed = _hash("correct horse")
+
+    assert security.verify_password("correct horse", hashed)
+    assert security.verify_password("correct horse", hashed)
+
+    assert len(checkpw_calls) == 1
+    assert len(security._verify_cache) == 1
+
+
+def test_verify_password_changed_hash_misses_cache(checkpw_calls):
+    old_hash = _hash("correct horse")
+    assert security.verify_password("correct horse", old_hash)
+
+    # Password changed: the cached entry belongs to the old hash
+    new_hash = _hash("battery staple")
+    assert not security.verify_password("correct horse", new_hash)
+    assert security.verify_password("battery staple", new_hash)
+
+    assert len(checkpw_calls) == 3
+
+
+def test_verify_password_cache_entry_expires(checkpw_calls, monkeypatch):
+    hashed = _hash("correct horse")
+    now = 1000.0
+    monkeypatch.setattr(security.time, "monotonic", lambda: now)
+    assert security.verify_password("correct horse", hashed)
+
+    now += security._VERIFY_CACHE_TTL - 1
+    assert security.verify_password("correct horse", hashed)
+    assert len(checkpw_calls) == 1
+
+    now += 1
+    assert security.verify_password("correct horse", hashed)
+    assert len(checkpw_calls) == 2
+
+
+def test_verify_password_wrong_password_is_never_cached(checkpw_calls):
+    hashed = _hash("correct horse")
+
+    for _ in range(3):
+        assert not security.verify_password("wrong horse", hashed)
+
+    assert len(checkpw_calls) == 3
+    assert not security._verify_cache
+
+
+def test_verify_password_rotated_secret_misses_cache(checkpw_calls, monkeypatch):
+    hashed = _hash("correct horse")
+    assert security.verify_password("correct horse", hashed)
+
+    monkeypatch.setattr(security.settings, "jwt_secret_key", "rotated-secret")
+    assert security.verify_password("correct horse", hashed)
+
+    assert len(checkpw_calls) == 2
+
+
+def test_verify_password_rejects_missing_or_invalid_hash():
+    assert not security.verify_password("correct horse", None)
+    assert not security.verify_password("correct horse", "")
+    assert not security.verify_password("correct horse", "not-a-bcrypt-hash")
+
+
+# Hashes written by passlib's CryptContext (bcrypt scheme, builtin backend,
+# rounds=4 to keep the tests fast), which silently truncated to 72 bytes
+PASSLIB_HASHES = {
+    "correct horse battery staple": "$2b$04$zrE2PVL9vWOrNHL5b9VuuuCrVEPPdZiHjlKR5MURYBBWD7CI49JvK",
+    "x" * 72: "$2b$04$JWgSc9AY8VXBNa6wBERMV.pOmftpAXGwWqXhaJ6h5J8R1dPRSTnIG",
+    # 80 bytes of UTF-8, stored from its first 72
+    "\u00e9" * 40: "$2b$04$W1.1VttorfTMbnjV.x6VoeB1dwkXLdFSBWc13x0BAA9zJSbtTBeNS",
+}
+
+
+@pytest.mark.parametrize("password,hashed", PASSLIB_HASHES.items())
+def test_verify_password_accepts_passlib_hashes(password, hashed):
+    assert security.verify_password(password, hashed)
+    assert not security.verify_password("wrong " + password, hashed)
+
+
+def test_verify_password_long_legacy_password_matches_on_first_72_bytes():
+    hashed = PASSLIB_HASHES["\u00e9" * 40]
+    # Anything sharing the first 72 bytes matched under passlib too
+    assert security.verify_password("\u00e9" * 36 + "anything", hashed)
+    assert not security.verify_password("\u00e9" * 35, hashed)
+
+
+def test_get_password_hash_round_trips():
+    hashed = security.get_password_hash("correct horse battery staple")
+    assert hashed.startswith("$2b$12$")
+    assert security.verify_password("correct horse battery staple", hashed)
+    assert not security.verify_password("correct horse battery stapler", hashed)
+
+
+def test_register_rejects_password_over_72_bytes():
+    # 37 characters, 74 bytes: within max_length but past bcrypt's limit
+    with pytest.raises(ValidationError, match="at most 72 bytes"):
+        UserRegister(email="parent@example.com", password="\u00e9" * 37, full_name="Parent")
+    with pytest.raises(ValidationError, match="at most 72 bytes"):
+        UserRegister(email="parent@example.com", password="x" * 73, full_name="Parent")
+
+
+def test_register_accepts_password_of_72_bytes():
+    user = UserRegister(email="parent@example.com", password="\u00e9" * 36, full_name="Parent")
+    assert len(user.password.encode()) == 72
+
+
+def test_login_accepts_long_legacy_password():
+    # Existing accounts may still hold a longer password
+    login = UserLogin(email="parent@example.com", password="\u00e9" * 40)
+    assert security.verify_password(login.password, PASSLIB_HASHES["\u00e9" * 40])
+
+
+def _tampered(token: str, **claims) -> str:
+    """Swap the token's payload for one with changed claims, keeping the signature."""
+    header, payload, signature = token.split(".")
+    decoded = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    decoded.update(claims)
+    forged = base64.urlsafe_b64encode(json.dumps(decoded).encode()).rstrip(b"=").decode()
+    return f"{header}.{forged}.{signature}"
+
+
+def test_decode_token_caches_verified_payload(monkeypatch):
+    token = security.create_access_token({"sub": "42"})
+    calls = []
+    real_decode = jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *a, **kw: calls.append(a) or real_decode(*a, **kw))
+
+    first = security.decode_token(token)
+    first["sub"] = "mutated"
+    assert security.decode_token(token)["sub"] == "42"
+    assert len(calls) == 1
+
+
+def test_decode_token_cache_entry_never_outlives_exp():
+    exp = int(time.time()) + 10
+    token = jwt.encode({"sub": "42", "exp": exp}, security._JWT_KEY, algorithm=security.settings.jwt_algorithm)
+
+    security.decode_token(token)
+
+    (_, expires_at), = security._token_cache.values()
+    assert expires_at == exp
+
+
+def test_decode_token_rejects_expired_token_even_when_cached():
+    exp = int(time.time()) + 2
+    token = jwt.encode({"sub": "42", "exp": exp}, security._JWT_KEY, algorithm=security.settings.jwt_algorithm)
+    assert security.decode_token(token)["sub"] == "42"
+    assert security._token_cache
+
+    time.sleep(max(0.0, exp - time.time()) + 0.05)
+
+    with pytest.raises(jwt.ExpiredSignatureError):
+        security.decode_token(token)
+    assert not security._token_cache
+
+
+def test_decode_token_never_serves_tampered_token_from_cache():
+    token = security.create_access_token({"sub": "42"})
+    assert security.decode_token(token)["sub"] == "42"
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        security.decode_token(_tampered(token, sub="1"))
+
+    header, payload, signature = token.split(".")
+    middle = len(signature) // 2
+    flipped = signature[:middle] + ("A" if signature[middle] != "A" else "B") + signature[middle + 1:]
+    with pytest.raises(jwt.InvalidSignatureError):
+        security.decode_token(f"{header}.{payload}.{flipped}")
+
+    assert len(security._token_cache) == 1
+
+
+def test_decode_token_rejects_token_signed_with_other_key():
+    token = jwt.encode(
+        {"sub": "42", "exp": int(time.time()) + 60}, "another-secret-of-at-least-32-bytes",
+        algorithm=security.settings.jwt_algorithm
+    )
+    with pytest.raises(jwt.InvalidSignatureError):
+        security.decode_token(token)
+    assert not security._token_cache